@@ -1,258 +1,356 @@
-import os
-import fitz  # PyMuPDF
-import requests
-import magic  # pip install python-magic
-import mimetypes
-from typing import Any, Text, Dict, List, Tuple
-from rasa_sdk import Action, Tracker
-from rasa_sdk.executor import CollectingDispatcher
+import re
+import time
+import logging
+import functools
+from typing import Any, Text, Optional, Tuple
+from rasa_sdk import Action
 from rasa_sdk.events import SlotSet
-from dotenv import load_dotenv
+from .llm_client import LLM_MODEL, LLMServiceError, llm_stats, request_completion
+from .response_cache import make_cache_key, response_cache
+from .resume_store import resume_index, resume_store
+from .resume_analysis import RESUME_ANALYZE_ONCE, analyze_resume_structured, cached_section_answer
+from .resume_sections import ACTION_SECTIONS, COMPARE_SECTIONS, claimed_text, section_spans, section_text
+from .prompt_budget import budget_for, budget_resume_text, count_tokens
+from .resume_retrieval import retrieval_context, tokenize
+from .resume_stats import listed_skills, render_stats, resume_stats
+from .skill_taxonomy import PROFICIENCY_RE, compare_skills, render_techstack, skill_matcher
+from .candidate_corpus import RANK_TOP_N, candidate_corpus, render_ranking
+from .contact_extraction import CONTACT_MIN_CONFIDENCE, contact_details, render_contact
+from .prefetch import RESUME_PREFETCH, RESUME_PREFETCH_ACTIONS, schedule_prefetch
+from .prefetch import stats as prefetch_stats
+from .metrics import cache_lookups, current_action, stage_timer, timed_action
+from .pdf_extraction import (ExtractedResume, decode_pdf_base64, extract_resume_async, extract_resume_bytes_async,
+                             store_extracted_resume)
 
-load_dotenv()
+PROMPT_TEMPLATE_VERSION = "6"  # bump whenever a prompt below changes, to invalidate cached answers
+UPLOAD_METADATA_KEY = "resume_pdf_base64"  # message metadata carrying an in-memory upload
+UPLOAD_ID_METADATA_KEY = "resume_id"  # message metadata naming a resume stored by actions.upload_server
 
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-OPENROUTER_MODEL = "mistralai/mistral-7b-instruct"
-OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
-PDF_KEYWORDS = ["education", "experience", "skills", "project", "summary", "profile", "certification"]
+# "rank all resumes against this job description" names no requirement: these words alone are not a JD
+RANK_REQUEST_TERMS = set(tokenize("rank ranking all candidates resumes cvs applicants against shortlist best fit job description role position"))
 
-def is_file_pdf(file_path: str) -> bool:
-    try:
-        mime_type = magic.from_file(file_path, mime=True)
-        if mime_type == "application/pdf":
-            return True
-        guess, _ = mimetypes.guess_type(file_path)
-        return guess == "application/pdf"
-    except Exception:
-        return False
+logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(file_path: str) -> Tuple[str, str]:
-    if not os.path.isfile(file_path):
-        return "", f"❌ File not found: {file_path}"
-    if os.path.getsize(file_path) > 2 * 1024 * 1024:
-        return "", "❌ File too large. Please upload a PDF under 2MB."
-    if not is_file_pdf(file_path):
-        return "", "❌ Uploaded file is not a valid PDF file. Only PDF resumes are supported."
+async def call_openrouter_cached(action_name: str, prompt: str, resume_text: str, variant: str = "",
+                                 section: Optional[str] = None, raise_errors: bool = False) -> str:
+    if section:
+        answer = cached_section_answer(resume_text, section)
+        if answer is not None:
+            cache_lookups.inc(result="structured")
+            return answer
+    key = make_cache_key(resume_text, action_name, PROMPT_TEMPLATE_VERSION, LLM_MODEL, variant)
+    cached = response_cache.get(key)
+    cache_lookups.inc(result="miss" if cached is None else "hit")
+    if cached is not None:
+        return cached
+    if logger.isEnabledFor(logging.DEBUG):  # totals are in the resume_llm_tokens_total metric
+        logger.debug("%s: sending ~%d prompt tokens", action_name, count_tokens(prompt))
     try:
-        doc = fitz.open(file_path)
-        if doc.page_count == 0:
-            return "", "❌ The uploaded PDF has no pages."
-        text = "".join(page.get_text() for page in doc)
-        doc.close()
-        if not text.strip():
-            return "", "❌ The PDF appears empty or could not be read."
-        if not any(k in text.lower() for k in PDF_KEYWORDS):
-            return "", "❌ This PDF does not appear to be a resume. Please upload a proper resume document."
-        return text, ""
-    except RuntimeError as e:
-        if "encrypted" in str(e).lower():
-            return "", "❌ The PDF is encrypted/protected and cannot be processed."
-        return "", f"❌ Error extracting PDF text: {e}"
-    except Exception as e:
-        return "", f"❌ Error extracting PDF: {e}"
+        # Joins an identical call already in flight, e.g. a prefetch of this same question.
+        with stage_timer("llm_call"):
+            response = await request_completion(prompt)
+    except LLMServiceError as e:
+        if raise_errors:
+            raise  # background callers (prefetch) count failures instead of showing them
+        return str(e)  # failures are shown to the user but never cached
+    response_cache.set(key, response)
+    return response
 
-def call_openrouter_api(prompt: str) -> str:
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    data = {
-        "model": OPENROUTER_MODEL,
-        "messages": [{"role": "user", "content": prompt}],
-    }
-    try:
-        response = requests.post(OPENROUTER_API_URL, headers=headers, json=data, timeout=45)
-        if response.status_code == 429:
-            return "⏱️ Rate limit reached. Please wait a moment and try again."
-        elif response.status_code == 503:
-            return "🔧 AI service temporarily unavailable. Please try again shortly."
-        response.raise_for_status()
-        result = response.json()
-        content = result["choices"][0]["message"]["content"]
-        return content.strip()
-    except requests.exceptions.Timeout:
-        return "⏱️ Analysis is taking longer than expected. Please try a simpler query."
-    except requests.exceptions.ConnectionError:
-        return "🔌 Connection issue detected. Please check your internet connection."
-    except Exception as e:
-        print(f"Error calling OpenRouter API: {e}")
-        return "Sorry, I couldn't analyze the resume right now. Please try again."
+async def answer_section_question(action, resume_id: str, resume_text: str, raise_errors: bool = False) -> str:
+    current_action.set(action.name())  # prefetch tasks inherit the upload's context
+    local_answer = getattr(action, "local_answer", None)
+    answer = local_answer(resume_id, resume_text) if local_answer else None
+    if answer is not None:
+        cache_lookups.inc(result="local")
+        return answer
+    with stage_timer("prompt_build"):
+        resume_section = budget_resume_text(action.name(), resume_text, section_spans(resume_id, resume_text),
+                                            keep=ACTION_SECTIONS[action.section],
+                                            excerpt=section_text(resume_id, resume_text, action.section))
+        prompt = action.build_prompt(resume_section)
+    return await call_openrouter_cached(action.name(), prompt, resume_text, section=action.section,
+                                        raise_errors=raise_errors)
+
+def ensure_slots_persist(tracker) -> Tuple[bool, Optional[str], Optional[str]]:
+    with stage_timer("recovery"):
+        return _recover_resume(tracker)
 
-def ensure_slots_persist(tracker):
+def _recover_resume(tracker) -> Tuple[bool, Optional[str], Optional[str]]:
     resume_uploaded = tracker.get_slot("resume_uploaded")
-    resume_text = tracker.get_slot("resume_text")
-    if resume_uploaded and resume_text:
-        return resume_uploaded, resume_text
-    # Fallback: Try to recover from events
-    events = tracker.events
-    recovered_text = None
-    for event in reversed(events):
-        if hasattr(event, 'name') and hasattr(event, 'value'):
-            if event.name == 'resume_text' and event.value:
-                recovered_text = event.value
-                return True, recovered_text
-    return False, None
+    resume_id = tracker.get_slot("resume_id")
+    if resume_uploaded and resume_id:
+        resume_text = resume_store.get(resume_id)
+        if resume_text:
+            resume_index.record(tracker.sender_id, resume_id)
+            return True, resume_id, resume_text
+    legacy_text = tracker.get_slot("resume_text")
+    if resume_uploaded and legacy_text:
+        # Conversations started before the resume store still carry the full text.
+        resume_id = resume_store.put(legacy_text)
+        resume_index.record(tracker.sender_id, resume_id)
+        return True, resume_id, legacy_text
+    # Fast path: latest upload recorded for this conversation
+    resume_id = resume_index.lookup(tracker.sender_id)
+    resume_text = resume_store.get(resume_id) if resume_id else None
+    if resume_text:
+        return True, resume_id, resume_text
+    # Cold start (e.g. after an action server restart): recover from events
+    resume_id, resume_text = _scan_events_for_resume(tracker.events)
+    if resume_id:
+        resume_index.record(tracker.sender_id, resume_id)
+        return True, resume_id, resume_text
+    return False, None, None
+
+def _scan_events_for_resume(events) -> Tuple[Optional[str], Optional[str]]:
+    start = time.perf_counter()
+    scanned = 0
+    try:
+        for event in reversed(events):
+            scanned += 1
+            name, value = _slot_event(event)
+            if name == 'resume_id' and value:
+                resume_text = resume_store.get(value)
+                if resume_text:
+                    return value, resume_text
+            elif name == 'resume_text' and value:
+                return resume_store.put(value), value
+        return None, None
+    finally:
+        resume_index.record_scan(scanned, time.perf_counter() - start)
+
+def _slot_event(event) -> Tuple[Optional[str], Any]:
+    # rasa_sdk hands events over as dicts; keep supporting event objects too.
+    if isinstance(event, dict):
+        if event.get('event') == 'slot':
+            return event.get('name'), event.get('value')
+        return None, None
+    return getattr(event, 'name', None), getattr(event, 'value', None)
 
 # ---- ACTION HANDLERS ----
 
 class ActionUploadResume(Action):
     def name(self) -> Text: return "action_upload_resume"
-    def run(self, dispatcher, tracker, domain):
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
         user_message = tracker.latest_message.get('text', '')
-        if user_message.startswith('/upload '):
-            file_path = user_message.replace('/upload ', '').strip()
-            text, error = extract_text_from_pdf(file_path)
-            if error:
-                dispatcher.utter_message(text=error)
+        metadata = tracker.latest_message.get('metadata') or {}
+        if metadata.get(UPLOAD_ID_METADATA_KEY):
+            # Already parsed and stored by the upload server (actions.upload_server): only the id travels.
+            source = metadata.get('file_name') or "uploaded file"
+            resume_id = str(metadata[UPLOAD_ID_METADATA_KEY])
+            text = resume_store.get(resume_id) if re.fullmatch(r"[0-9a-f]{24}", resume_id) else None
+            if not text:
+                dispatcher.utter_message(text="❌ Unknown resume id. Please upload the PDF again.")
                 return [SlotSet("resume_uploaded", False)]
-            dispatcher.utter_message(text=f"✅ Resume uploaded successfully from: {file_path}")
-            dispatcher.utter_message(text="Now you can ask me questions about the candidate!")
-            return [SlotSet("resume_uploaded", True), SlotSet("resume_text", text)]
         else:
-            dispatcher.utter_message(text="To upload a resume, use: /upload /path/to/your/resume.pdf")
-            return [SlotSet("resume_uploaded", False)]
+            if metadata.get(UPLOAD_METADATA_KEY):
+                # Client sent the PDF itself (base64 in message metadata): parse it from memory.
+                source = metadata.get('file_name') or "uploaded file"
+                data, error = decode_pdf_base64(metadata[UPLOAD_METADATA_KEY])
+                result = ExtractedResume("", {}, error)
+                if not error:
+                    with stage_timer("pdf_parse"):
+                        result = await extract_resume_bytes_async(data)
+            elif user_message.startswith('/upload '):
+                source = user_message.replace('/upload ', '').strip()
+                with stage_timer("pdf_parse"):
+                    result = await extract_resume_async(source)
+            else:
+                dispatcher.utter_message(text="To upload a resume, use: /upload /path/to/your/resume.pdf")
+                return [SlotSet("resume_uploaded", False)]
+            if result.error:
+                dispatcher.utter_message(text=result.error)
+                return [SlotSet("resume_uploaded", False)]
+            text = result.text
+            resume_id = store_extracted_resume(result, source)
+        resume_index.record(tracker.sender_id, resume_id)
+        if RESUME_ANALYZE_ONCE:
+            with stage_timer("llm_call"):
+                await analyze_resume_structured(text)
+        if RESUME_PREFETCH:
+            schedule_prefetch([functools.partial(answer_section_question, SECTION_ACTIONS[name], resume_id, text,
+                                                 raise_errors=True)
+                               for name in RESUME_PREFETCH_ACTIONS if name in SECTION_ACTIONS])
+        dispatcher.utter_message(text=f"✅ Resume uploaded successfully from: {source}")
+        dispatcher.utter_message(text="Now you can ask me questions about the candidate!")
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id), SlotSet("resume_text", None)]
 
 class ActionAskSkills(Action):
+    section = "skills"
     def name(self) -> Text: return "action_ask_skills"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
-        if not resume_uploaded or not resume_text:
-            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
-            return []
-        prompt = (
+    def build_prompt(self, resume_section: str) -> str:
+        return (
             "From the given resume, extract all skills exactly as written.\n\n"
             "✅ If the resume already categorizes skills (e.g., Technical Skills, Soft Skills, Tools, etc.), retain the same categories and formatting.\n"
             "✅ If no categorization is present, then organize the extracted skills into two groups: Technical Skills and Soft Skills.\n"
             "❌ Do not assume, interpret, or add any skills not explicitly mentioned.\n"
             "❌ Only include content from the Skills section(s) of the resume. Ignore skills implied elsewhere (e.g., in projects or experience).\n\n"
-            f"Resume text:\n{resume_text}"
+            f"Resume text:\n{resume_section}"
         )
-        response = call_openrouter_api(prompt)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
+        if not resume_uploaded or not resume_text:
+            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
+            return []
+        response = await answer_section_question(self, resume_id, resume_text)
         dispatcher.utter_message(text=response)
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
 
 class ActionAskSummary(Action):
+    section = "summary"
     def name(self) -> Text: return "action_ask_summary"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
-        if not resume_uploaded or not resume_text:
-            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
-            return []
-        prompt = (
+    def build_prompt(self, resume_section: str) -> str:
+        return (
             "Extract the Professional Summary of the candidate from the given resume.\n"
             "✅ If a summary/profile/objective section is explicitly written in the resume, extract that exact content only.\n"
             "✅ If not available, generate a concise and professional summary based solely on the actual content of the resume, including:\n"
             "- Key strengths\n- Experience level\n- Notable achievements\n- Overall profile and areas of expertise\n"
             "❌ Do not assume or add anything not present in the resume.\n"
             "❌ No filler or generalizations — strictly base it on resume content.\n\n"
-            f"Resume text:\n{resume_text}"
+            f"Resume text:\n{resume_section}"
         )
-        response = call_openrouter_api(prompt)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
+        if not resume_uploaded or not resume_text:
+            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
+            return []
+        response = await answer_section_question(self, resume_id, resume_text)
         dispatcher.utter_message(text=response)
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
 
 class ActionAskExperience(Action):
+    section = "experience"
     def name(self) -> Text: return "action_ask_experience"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
-        if not resume_uploaded or not resume_text:
-            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
-            return []
-        prompt = (
+    def build_prompt(self, resume_section: str) -> str:
+        return (
             "Analyze the following resume and extract only the Work Experience details.\n"
             "✅ For each experience, provide:\n"
             "- Job Title\n- Company Name\n- Duration (Start – End)\n- Key Responsibilities (as bullet points, if available) or summary or description given in resume\n"
             "✅ Present the experiences in reverse chronological order (most recent first).\n"
             "❌ Do not include internship/project/volunteer experience unless it's under the Work Experience heading.\n"
             "❌ No summaries, no assumptions. Only extract what’s written in the resume.\n\n"
-            f"Resume text:\n{resume_text}"
+            f"Resume text:\n{resume_section}"
         )
-        response = call_openrouter_api(prompt)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
+        if not resume_uploaded or not resume_text:
+            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
+            return []
+        response = await answer_section_question(self, resume_id, resume_text)
         dispatcher.utter_message(text=response)
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
 
 class ActionAskTechstack(Action):
+    section = "techstack"
     def name(self) -> Text: return "action_ask_techstack"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
-        if not resume_uploaded or not resume_text:
-            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
-            return []
-        prompt = (
+    def build_prompt(self, resume_section: str) -> str:
+        return (
             "From the given resume, extract only the technologies listed under the 'Skills' section.\n"
             "✅ Categorize them clearly into,\n"
             "- Programming Languages\n- Frameworks/Libraries\n- Databases\n- Tools\n- Platforms/Cloud\n"
             "✅ Include proficiency levels if mentioned.\n"
             "❌ Do not include any technologies outside the 'Skills' section.\n"
             "❌ No assumptions or additions. Just what's explicitly listed.\n"
-            f"Resume text:\n{resume_text}"
+            f"Resume text:\n{resume_section}"
         )
-        response = call_openrouter_api(prompt)
+    def local_answer(self, resume_id: str, resume_text: str) -> Optional[str]:
+        # Skills-section technologies by taxonomy category, the rest under "Other". No Skills section,
+        # or proficiency levels the local answer can't attach to each skill, go to the LLM.
+        if "skills" not in section_spans(resume_id, resume_text):
+            return None
+        skills_text = section_text(resume_id, resume_text, self.section)
+        skills = skill_matcher.find(skills_text)
+        if not skills or PROFICIENCY_RE.search(skills_text):
+            return None
+        other = [item for item in listed_skills(skills_text) if not skill_matcher.find(item)]
+        return render_techstack(skill_matcher.categorize(skills), other)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
+        if not resume_uploaded or not resume_text:
+            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
+            return []
+        response = await answer_section_question(self, resume_id, resume_text)
         dispatcher.utter_message(text=response)
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
 
 class ActionAskEducation(Action):
+    section = "education"
     def name(self) -> Text: return "action_ask_education"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
-        if not resume_uploaded or not resume_text:
-            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
-            return []
-        prompt = (
+    def build_prompt(self, resume_section: str) -> str:
+        return (
             "Extract the following educational details from the given resume:\n"
             "- Degree name\n- Institution name\n- Graduation year\n- CGPA (if mentioned)\n"
             "⚠️ Only return these four fields.\n"
-            f"Resume text:\n{resume_text}"
+            f"Resume text:\n{resume_section}"
         )
-        response = call_openrouter_api(prompt)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
+        if not resume_uploaded or not resume_text:
+            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
+            return []
+        response = await answer_section_question(self, resume_id, resume_text)
         dispatcher.utter_message(text=response)
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
 
 class ActionAskContact(Action):
+    section = "contact"
     def name(self) -> Text: return "action_ask_contact"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
-        if not resume_uploaded or not resume_text:
-            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
-            return []
-        prompt = (
+    def build_prompt(self, resume_section: str) -> str:
+        return (
             "Extract contact information from this resume.\n"
             "Include name, email, phone number, location, LinkedIn profile, and any other contact details.\n"
             "Present in a clean, organized format.\n"
-            f"Resume text:\n{resume_text}\nPlease provide contact information."
+            f"Resume text:\n{resume_section}\nPlease provide contact information."
         )
-        response = call_openrouter_api(prompt)
+    def local_answer(self, resume_id: str, resume_text: str) -> Optional[str]:
+        # Regexes + PDF link annotations from upload; the LLM only sees resumes they couldn't read.
+        details = contact_details(resume_id, resume_text, section_spans(resume_id, resume_text))
+        if details["confidence"] < CONTACT_MIN_CONFIDENCE:
+            return None
+        return render_contact(details["fields"])
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
+        if not resume_uploaded or not resume_text:
+            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
+            return []
+        response = await answer_section_question(self, resume_id, resume_text)
         dispatcher.utter_message(text=response)
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
 
 class ActionAskProjects(Action):
+    section = "projects"
     def name(self) -> Text: return "action_ask_projects"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
-        if not resume_uploaded or not resume_text:
-            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
-            return []
-        prompt = (
+    def build_prompt(self, resume_section: str) -> str:
+        return (
             "Extract detailed Project information from the given resume.\n"
             "✅ For each project, include:\n"
             "- Project Name\n- Description (as written)\n- Technologies Used\n- Duration (if mentioned)\n- Outcomes or Results (if mentioned)\n"
             "✅ Maintain the exact structure, wording, and formatting from the resume where available.\n"
             "❌ Do not summarize or infer anything that isn’t explicitly stated.\n"
             "❌ Only pull information from the Projects section (not from Experience or elsewhere).\n"
-            f"Resume text:\n{resume_text}"
+            f"Resume text:\n{resume_section}"
         )
-        response = call_openrouter_api(prompt)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
+        if not resume_uploaded or not resume_text:
+            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
+            return []
+        response = await answer_section_question(self, resume_id, resume_text)
         dispatcher.utter_message(text=response)
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
 
 class ActionAskCertifications(Action):
+    section = "certifications"
     def name(self) -> Text: return "action_ask_certifications"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
-        if not resume_uploaded or not resume_text:
-            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
-            return []
-        prompt = (
+    def build_prompt(self, resume_section: str) -> str:
+        return (
             "From the given resume, extract the following sections exactly as they appear:\n"
             "- Certifications\n- Awards\n- Achievements\n"
             "✅ For each item, include (if mentioned):\n"
@@ -261,43 +359,99 @@ class ActionAskCertifications(Action):
             "❌ Do not rephrase, infer, or generate any content.\n"
             "❌ No personal responses\n"
             "❌ Only extract from given labeled sections like 'Certifications', 'Achievements', 'Awards', or similar.\n"
-            f"Resume text:\n{resume_text}"
+            f"Resume text:\n{resume_section}"
         )
-        response = call_openrouter_api(prompt)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
+        if not resume_uploaded or not resume_text:
+            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
+            return []
+        response = await answer_section_question(self, resume_id, resume_text)
         dispatcher.utter_message(text=response)
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
+
+class ActionAskGeneral(Action):
+    def name(self) -> Text: return "action_ask_general"
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
+        if not resume_uploaded or not resume_text:
+            dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
+            return []
+        user_message = tracker.latest_message.get('text', '')
+        with stage_timer("prompt_build"):
+            spans = section_spans(resume_id, resume_text)
+            # Only the chunks that match the question; the whole (budgeted) resume if none do.
+            context = retrieval_context(resume_id, resume_text, spans, user_message, budget_for(self.name()))
+            if context is None:
+                context = budget_resume_text(self.name(), resume_text, spans)
+        prompt = (
+            "Based on the following resume excerpts, answer the question below using only the information mentioned in them.\n\n"
+            f"Question: {user_message}\n"
+            "✅ Refer strictly to resume content — do not infer or generate anything not clearly stated.\n"
+            "✅ If the answer is not found in the excerpts, respond with: \"Not mentioned in the resume.\"\n"
+            "❌ No assumptions, summaries, or external knowledge.\n\n"
+            f"Resume excerpts:\n{context}"
+        )
+        response = await call_openrouter_cached(self.name(), prompt, resume_text, variant=user_message)
+        dispatcher.utter_message(text=response)
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
 
 class ActionCompareSkills(Action):
     def name(self) -> Text: return "action_compare_skills"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
         if not resume_uploaded or not resume_text:
             dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
             return []
         user_message = tracker.latest_message.get('text', '')
+        spans = section_spans(resume_id, resume_text)
+        with stage_timer("prompt_build"):
+            required = skill_matcher.find(user_message)
+            resume_excerpt = budget_resume_text(self.name(), resume_text, spans, keep=COMPARE_SECTIONS)
+        if not required:
+            # No known skill in the requirements: let the LLM read them.
+            prompt = (
+                f"Based on this resume and job requirements mentioned in the question: '{user_message}'\n"
+                "Please compare the candidate's skills with the job requirements and provide:\n"
+                "1. Matching skills\n2. Missing skills\n3. Overall fit assessment\n4. Recommendations\n\n"
+                f"Resume text:\n{resume_excerpt}"
+            )
+            response = await call_openrouter_cached(self.name(), prompt, resume_text, variant=user_message)
+            dispatcher.utter_message(text=response)
+            return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
+        matching, missing = compare_skills(required, skill_matcher.find(claimed_text(resume_text, spans)))
+        dispatcher.utter_message(text=f"✅ Matching skills: {', '.join(matching) or 'none'}\n"
+                                      f"❌ Missing skills: {', '.join(missing) or 'none'}")
         prompt = (
-            f"Based on this resume and job requirements mentioned in the question: '{user_message}'\n"
-            "Please compare the candidate's skills with the job requirements and provide:\n"
-            "1. Matching skills\n2. Missing skills\n3. Overall fit assessment\n4. Recommendations\n\n"
-            f"Resume text:\n{resume_text}"
+            f"Job requirements mentioned in the question: '{user_message}'\n"
+            f"Required skills found in the resume: {', '.join(matching) or 'none'}\n"
+            f"Required skills not found in the resume: {', '.join(missing) or 'none'}\n"
+            "Based on this resume, provide:\n1. Overall fit assessment\n2. Recommendations\n"
+            "❌ Do not list the matching or missing skills again.\n\n"
+            f"Resume text:\n{resume_excerpt}"
         )
-        response = call_openrouter_api(prompt)
+        response = await call_openrouter_cached(self.name(), prompt, resume_text, variant=user_message)
         dispatcher.utter_message(text=response)
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
 
 class ActionGetResumeStats(Action):
     def name(self) -> Text: return "action_get_resume_stats"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
         if not resume_uploaded or not resume_text:
             dispatcher.utter_message(text="Please upload a resume first using: /upload /path/to/resume.pdf")
             return []
+        spans = section_spans(resume_id, resume_text)
+        # Counts and dates are computed here; the LLM only judges what can't be counted.
+        dispatcher.utter_message(text=f"📊 Resume Statistics:\n{render_stats(resume_stats(resume_text, spans))}")
+        with stage_timer("prompt_build"):
+            resume_excerpt = budget_resume_text(self.name(), resume_text, spans, keep=("experience", "skills", "education"))
         prompt = (
-            "Analyze the following resume and provide a detailed overview report containing only the following items:\n"
-            "Total Years of Experience (based on the Work Experience section)\n"
-            "Number of Jobs/Positions Held\n"
-            "Total Number of Unique Skills Mentioned (only from explicitly listed skills sections)\n"
-            "Highest Education Level (Degree name, Institution, Graduation Year)\n"
+            "Analyze the following resume and provide a report containing only the following items:\n"
             "Key Highlights (Notable projects, certifications, achievements—based only on actual content)\n"
             "Resume Quality Assessment:\n"
             "- Clarity & structure\n- Professional tone\n- Relevance of content\n- Visual formatting (if applicable)\n"
@@ -305,25 +459,57 @@ class ActionGetResumeStats(Action):
             "✅ Base everything strictly on the content present in the resume.\n"
             "❌ Do not make assumptions or generate content not mentioned.\n"
             "❌ No hallucinations, fluff, or generic advice.\n\n"
-            f"Resume text:\n{resume_text}"
+            f"Resume text:\n{resume_excerpt}"
         )
-        response = call_openrouter_api(prompt)
-        dispatcher.utter_message(text=f"📊 Resume Statistics:\n{response}")
-        return [SlotSet("resume_uploaded", True), SlotSet("resume_text", resume_text)]
+        response = await call_openrouter_cached(self.name(), prompt, resume_text)
+        dispatcher.utter_message(text=f"📝 Resume Assessment:\n{response}")
+        return [SlotSet("resume_uploaded", True), SlotSet("resume_id", resume_id)]
+
+class ActionRankCandidates(Action):
+    def name(self) -> Text: return "action_rank_candidates"
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        # Every uploaded or batch-ingested resume, scored locally: no LLM call, no resume needed in this chat.
+        job_description = tracker.latest_message.get('text', '')
+        if job_description.startswith('/rank'):  # "/rank <JD>" or "/rank_candidates <JD>"
+            job_description = job_description.split(maxsplit=1)[1] if len(job_description.split()) > 1 else ""
+        if not skill_matcher.find(job_description) and not set(tokenize(job_description)) - RANK_REQUEST_TERMS:
+            dispatcher.utter_message(text="To rank candidates, use: /rank <job description>")
+            return []
+        ranking = candidate_corpus.rank(job_description, RANK_TOP_N)
+        if not ranking:
+            dispatcher.utter_message(text="No candidates match this job description yet. Upload or batch-ingest resumes first.")
+            return []
+        dispatcher.utter_message(text=f"🏆 Top {len(ranking)} of {candidate_corpus.stats()['candidates']} candidates:\n"
+                                      f"{render_ranking(ranking)}")
+        return []
 
 class ActionDebugSlots(Action):
     def name(self) -> Text: return "action_debug_slots"
-    def run(self, dispatcher, tracker, domain):
-        resume_uploaded, resume_text = ensure_slots_persist(tracker)
+    @timed_action
+    async def run(self, dispatcher, tracker, domain):
+        resume_uploaded, resume_id, resume_text = ensure_slots_persist(tracker)
         all_slots = tracker.current_slot_values()
         dispatcher.utter_message(text="🔍 **Debug Information:**")
         dispatcher.utter_message(text=f"📊 resume_uploaded: {resume_uploaded}")
+        dispatcher.utter_message(text=f"🆔 resume_id: {resume_id}")
         dispatcher.utter_message(text=f"📝 resume_text exists: {'Yes' if resume_text else 'No'}")
         dispatcher.utter_message(text=f"📏 resume_text length: {len(resume_text) if resume_text else 0} characters")
         if resume_text:
             preview = resume_text[:100] + "--->...." if len(resume_text) > 200 else resume_text
             dispatcher.utter_message(text=f"👀 Text preview: {preview}")
+            dispatcher.utter_message(text=f"🧩 Resume sections: {', '.join(section_spans(resume_id, resume_text)) or 'none found'}")
+        dispatcher.utter_message(text=f"🗃️ Response cache: {response_cache.stats()}")
+        dispatcher.utter_message(text=f"⏱️ Resume recovery: {resume_index.stats()}")
+        dispatcher.utter_message(text=f"🚀 Prefetch: {prefetch_stats()}")
+        dispatcher.utter_message(text=f"🔗 LLM calls: {llm_stats()}")
         return [
             SlotSet("resume_uploaded", resume_uploaded if resume_uploaded else False),
-            SlotSet("resume_text", resume_text if resume_text else "")
+            SlotSet("resume_id", resume_id)
         ]
+
+# Actions whose answer only depends on the resume, i.e. safe to prefetch after upload.
+SECTION_ACTIONS = {action.name(): action for action in (
+    ActionAskSkills(), ActionAskSummary(), ActionAskExperience(), ActionAskTechstack(),
+    ActionAskEducation(), ActionAskContact(), ActionAskProjects(), ActionAskCertifications(),
+)}
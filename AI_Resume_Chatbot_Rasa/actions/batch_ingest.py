@@ -0,0 +1,74 @@
+"""Batch-ingest a directory (or glob) of PDF resumes.
+
+    python -m actions.batch_ingest resumes/                 # into the resume store
+    python -m actions.batch_ingest "inbox/**/*.pdf" --jsonl out.jsonl
+
+Validation and extraction are the same as /upload, run in a process pool.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+from .pdf_extraction import ExtractedResume, extract_resume_from_pdf, store_extracted_resume
+from .resume_store import resume_id_for
+from .text_normalize import normalization_report
+
+def find_pdfs(target: str) -> List[str]:
+    if os.path.isdir(target):
+        paths = [os.path.join(root, name)
+                 for root, _, names in os.walk(target)
+                 for name in names if name.lower().endswith(".pdf")]
+    else:
+        paths = glob.glob(target, recursive=True)
+    return sorted(p for p in paths if os.path.isfile(p))
+
+def ingest_one(path: str) -> Tuple[str, int, ExtractedResume]:
+    return path, os.path.getsize(path), extract_resume_from_pdf(path)
+
+def ingest(paths: List[str], workers: int, jsonl_path: str = "") -> int:
+    start = time.perf_counter()
+    ok = failed = total_bytes = 0
+    out = open(jsonl_path, "w", encoding="utf-8") if jsonl_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, size, result in pool.map(ingest_one, paths, chunksize=4):
+                total_bytes += size
+                if result.error:
+                    failed += 1
+                    print(f"{path}: {result.error}")
+                    continue
+                ok += 1
+                if out is not None:
+                    record = {"path": path, "resume_id": resume_id_for(result.text), "text": result.text,
+                              "sections": result.sections, "original_text": result.original_text,
+                              "normalization": normalization_report(result.original_text, result.text)}
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                else:
+                    print(f"{path}: ✅ {store_extracted_resume(result, path)}")
+    finally:
+        if out is not None:
+            out.close()
+    elapsed = max(time.perf_counter() - start, 1e-9)
+    print(f"Ingested {ok}/{len(paths)} files ({failed} rejected) in {elapsed:.2f}s with {workers} workers: "
+          f"{len(paths) / elapsed:.1f} files/s, {total_bytes / elapsed / 1e6:.2f} MB/s")
+    return failed
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("target", help="directory to walk for *.pdf, or a glob pattern")
+    parser.add_argument("--jsonl", default="", help="write results to this JSONL file instead of the resume store")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    paths = find_pdfs(args.target)
+    if not paths:
+        print(f"No PDF files found for: {args.target}")
+        return 1
+    failed = ingest(paths, max(1, args.workers), args.jsonl)
+    return 1 if failed == len(paths) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
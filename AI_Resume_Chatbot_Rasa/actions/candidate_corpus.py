@@ -0,0 +1,229 @@
+"""Corpus of every stored resume, ranked against a job description without the LLM.
+
+    python -m actions.candidate_corpus index                 # (re)index everything in the resume store
+    python -m actions.candidate_corpus rank jd.txt --top 20
+    python -m actions.candidate_corpus rank --text "Python, Django, AWS, 5+ years"
+
+Each candidate is one JSON line (sparse term counts + skill set) appended to
+CANDIDATE_CORPUS_FILE; the inverted index is built in memory on first use and
+catches up with lines other processes append. `index` also compacts the file.
+"""
+import os
+import sys
+import json
+import math
+import time
+import heapq
+import argparse
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from .resume_retrieval import BM25_B, BM25_K1, tokenize
+from .resume_sections import Spans, claimed_text, section_spans
+from .resume_store import RESUME_STORE_DIR, resume_store
+from .skill_taxonomy import compare_skills, skill_matcher
+
+CANDIDATE_CORPUS_FILE = os.getenv("CANDIDATE_CORPUS_FILE", os.path.join(RESUME_STORE_DIR, "candidates.jsonl"))
+RANK_TOP_N = int(os.getenv("RANK_TOP_N", "10"))
+RANK_SKILL_WEIGHT = float(os.getenv("RANK_SKILL_WEIGHT", "0.5"))  # rest of the score is BM25 text relevance
+
+class CandidateCorpus:
+    """Sparse term vectors and skill sets for all candidates, with an inverted index for ranking.
+
+    Scoring touches only the postings of the job description's terms, so one
+    ranking pass costs O(postings of the JD terms), not O(candidates x vocabulary).
+    """
+
+    def __init__(self, path: str = CANDIDATE_CORPUS_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int, int]] = None  # (inode, size, mtime) of the file as last read
+        self._reset()
+
+    def _reset(self) -> None:
+        self._candidates: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}  # term -> resume_id -> count
+        self._total_length = 0
+        self._offset = 0  # bytes of the file already indexed
+        self._lines = 0
+
+    def _load(self) -> None:
+        """Catch up with lines appended since the last call, by this process or another (batch_ingest, the CLI)."""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        if signature == self._signature:
+            return
+        if self._signature is not None and (st.st_ino != self._signature[0] or st.st_size < self._offset):
+            self._reset()  # compacted (replaced) since the last read: start over
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            data = f.read()
+        complete = data.rfind(b"\n") + 1  # a line still being written is read once it ends
+        for line in data[:complete].splitlines():
+            self._lines += 1
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a torn line from a crash
+            self._index(record)
+        self._offset += complete
+        self._signature = signature
+
+    def _index(self, record: Dict[str, Any]) -> None:
+        resume_id = record["resume_id"]
+        if resume_id in self._candidates:
+            self._unindex(resume_id)
+        self._candidates[resume_id] = record
+        for term, count in record["terms"].items():
+            self._postings.setdefault(term, {})[resume_id] = count
+        self._total_length += record["length"]
+
+    def _unindex(self, resume_id: str) -> None:
+        old = self._candidates.pop(resume_id)
+        for term in old["terms"]:
+            postings = self._postings.get(term, {})
+            postings.pop(resume_id, None)
+            if not postings:
+                self._postings.pop(term, None)
+        self._total_length -= old["length"]
+
+    def compact(self) -> int:
+        """Rewrite the file with one line per candidate, dropping lines of re-ingested resumes; returns how many.
+
+        The file is replaced, so lines another process appends meanwhile are lost: only the
+        index CLI command calls this, not the action server or batch ingestion.
+        """
+        with self._lock:
+            self._load()
+            stale = self._lines - len(self._candidates)
+            if stale <= 0:
+                return 0
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for record in self._candidates.values():
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+            st = os.stat(self.path)
+            self._signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+            self._offset, self._lines = st.st_size, len(self._candidates)
+            return stale
+
+    def add(self, resume_id: str, resume_text: str, name: str = "", source: str = "", spans: Optional[Spans] = None) -> None:
+        terms = Counter(tokenize(resume_text))
+        skills = skill_matcher.find(claimed_text(resume_text, spans or {}))  # the same sections compare_skills reads
+        record = {"resume_id": resume_id, "name": name, "source": source, "terms": dict(terms),
+                  "length": sum(terms.values()), "skills": skills}
+        with self._lock:
+            self._load()
+            existing = self._candidates.get(resume_id)
+            if existing is not None and not source:
+                record["source"] = existing["source"]
+            if record == existing:
+                return  # same resume (ids are content hashes) ingested again; `index` rewrites outdated records
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._index(record)  # the next _load reads this line again; re-indexing it is a no-op
+
+    def rank(self, job_description: str, top_n: int = RANK_TOP_N) -> List[Dict[str, Any]]:
+        """Top candidates for a job description: BM25 over the text blended with required-skill coverage."""
+        query = set(tokenize(job_description))
+        required = skill_matcher.find(job_description)
+        with self._lock:
+            self._load()
+            n = len(self._candidates)
+            if not n:
+                return []
+            avg_length = self._total_length / n or 1
+            text_scores: Dict[str, float] = {}
+            for term in query:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for resume_id, count in postings.items():
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * self._candidates[resume_id]["length"] / avg_length)
+                    text_scores[resume_id] = text_scores.get(resume_id, 0.0) + idf * count * (BM25_K1 + 1) / (count + norm)
+            best_text = max(text_scores.values(), default=0.0) or 1.0
+            skill_weight = RANK_SKILL_WEIGHT if required else 0.0
+            scored: List[Tuple[float, str, List[str], List[str]]] = []
+            for resume_id, record in self._candidates.items():
+                matching, missing = compare_skills(required, record["skills"])
+                coverage = len(matching) / len(required) if required else 0.0
+                score = (1 - skill_weight) * text_scores.get(resume_id, 0.0) / best_text + skill_weight * coverage
+                if score > 0:
+                    scored.append((score, resume_id, matching, missing))
+            top = heapq.nlargest(top_n, scored)
+            return [{"resume_id": resume_id, "name": self._candidates[resume_id]["name"],
+                     "source": self._candidates[resume_id]["source"], "score": round(score, 4),
+                     "matching": matching, "missing": missing}
+                    for score, resume_id, matching, missing in top]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            self._load()
+            return {"candidates": len(self._candidates), "terms": len(self._postings)}
+
+candidate_corpus = CandidateCorpus()
+
+def render_ranking(ranking: List[Dict[str, Any]]) -> str:
+    lines = []
+    for i, hit in enumerate(ranking, 1):
+        label = hit["name"] or os.path.basename(hit["source"]) or hit["resume_id"]
+        lines.append(f"{i}. {label} (score {hit['score']:.2f}, id {hit['resume_id']})")
+        lines.append(f"   ✅ {', '.join(hit['matching']) or '-'}   ❌ {', '.join(hit['missing']) or '-'}")
+    return "\n".join(lines)
+
+def stored_resume_ids(root: str = RESUME_STORE_DIR) -> List[str]:
+    if not os.path.isdir(root):
+        return []
+    return sorted(name[:-len(".txt.z")] for prefix in os.listdir(root) if os.path.isdir(os.path.join(root, prefix))
+                  for name in os.listdir(os.path.join(root, prefix)) if name.endswith(".txt.z"))
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("index", help="add every resume in the resume store to the corpus")
+    rank_parser = commands.add_parser("rank", help="rank candidates against a job description")
+    rank_parser.add_argument("jd_file", nargs="?", help="text file with the job description")
+    rank_parser.add_argument("--text", default="", help="job description given inline")
+    rank_parser.add_argument("--top", type=int, default=RANK_TOP_N)
+    rank_parser.add_argument("--json", action="store_true", help="print the ranking as JSON")
+    args = parser.parse_args(argv)
+
+    if args.command == "index":
+        start = time.perf_counter()
+        indexed = 0
+        for resume_id in stored_resume_ids():
+            resume_text = resume_store.get(resume_id)
+            if not resume_text:
+                continue  # unreadable or empty entry: nothing to rank
+            contact = resume_store.get_meta(resume_id, "contact") or {}
+            candidate_corpus.add(resume_id, resume_text, contact.get("fields", {}).get("name", ""),
+                                 spans=section_spans(resume_id, resume_text))
+            indexed += 1
+        stale = candidate_corpus.compact()
+        print(f"Indexed {indexed} resumes in {time.perf_counter() - start:.2f}s, dropped {stale} stale lines: "
+              f"{candidate_corpus.stats()}")
+        return 0
+    if args.jd_file:
+        with open(args.jd_file, encoding="utf-8") as f:
+            job_description = f.read()
+    else:
+        job_description = args.text
+    if not job_description.strip():
+        print("Give a job description file or --text")
+        return 1
+    candidate_corpus.stats()  # load outside the timed ranking
+    start = time.perf_counter()
+    ranking = candidate_corpus.rank(job_description, args.top)
+    elapsed = time.perf_counter() - start
+    print(json.dumps(ranking, indent=2) if args.json else render_ranking(ranking) or "No matching candidates.")
+    print(f"Ranked {candidate_corpus.stats()['candidates']} candidates in {1000 * elapsed:.1f} ms", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
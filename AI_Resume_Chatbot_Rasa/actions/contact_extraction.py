@@ -0,0 +1,116 @@
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional
+from .resume_sections import Spans, match_heading
+from .resume_store import resume_store
+from .skill_taxonomy import skill_matcher
+
+# Below this, ActionAskContact asks the LLM instead (email 0.35, phone 0.25, name 0.2, profile/location 0.2).
+CONTACT_MIN_CONFIDENCE = float(os.getenv("CONTACT_MIN_CONFIDENCE", "0.6"))
+CONTACT_META = "contact"
+HEADER_CHARS = 1500  # where contact details live when no header/contact section was found
+
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}", re.IGNORECASE)
+PHONE_RE = re.compile(r"(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,4}\)[\s.-]?)?\d{2,5}(?:[\s.-]?\d{2,5}){1,4}(?!\w)")
+LINKEDIN_RE = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[\w%-]+/?", re.IGNORECASE)
+GITHUB_RE = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[\w-]+/?", re.IGNORECASE)
+URL_RE = re.compile(r"(?:https?://|www\.)[^\s|,;()<>]+", re.IGNORECASE)
+LOCATION_LABEL_RE = re.compile(r"\b(?:location|address|based in)\s*[:\-]\s*([^|•\n]{3,60})", re.IGNORECASE)
+PLACE_RE = re.compile(r"^[A-Z][A-Za-z.' -]{1,30},\s*[A-Z][A-Za-z.' -]{1,30}(?:,\s*[A-Z][A-Za-z.' -]{1,30})?$")
+NAME_RE = re.compile(r"^[A-Z][A-Za-z.'-]*(?:\s+[A-Z][A-Za-z.'-]*){1,3}$")
+# Document titles and job-title words: "Curriculum Vitae" or "Senior Software Engineer" is never a name or a place.
+TITLE_WORDS = {"curriculum", "vitae", "resume", "résumé", "cv", "biodata", "portfolio", "profile", "engineer",
+               "developer", "manager", "analyst", "designer", "consultant", "intern", "architect", "scientist",
+               "senior", "junior", "lead", "software", "director", "officer", "specialist", "administrator",
+               "student", "associate", "executive", "head", "principal", "staff", "full", "stack"}
+_FIELD_SEPARATORS = re.compile(r"\s*(?:[|•·▪◦]|\t|\s{3,})\s*")
+
+def _phone(candidate: str) -> Optional[str]:
+    digits = re.sub(r"\D", "", candidate)
+    return candidate.strip() if 10 <= len(digits) <= 15 else None  # shorter runs are dates, ids, years
+
+def _url(value: str) -> str:
+    value = value.rstrip("/.")
+    return value if value.lower().startswith("http") else f"https://{value}"
+
+def contact_region(resume_text: str, spans: Spans) -> str:
+    parts = [resume_text[start:end] for name in ("header", "contact") for start, end in spans.get(name, [])]
+    return "\n".join(parts) if parts else resume_text[:HEADER_CHARS]
+
+def extract_contact(resume_text: str, spans: Spans, links: Iterable[str] = ()) -> Dict[str, Any]:
+    """Contact fields from the header/contact sections and the PDF's link annotations, with a confidence score."""
+    region = contact_region(resume_text, spans)
+    fields: Dict[str, Any] = {"name": "", "email": "", "phone": "", "location": "", "linkedin": "", "github": "", "other": []}
+    for uri in links:  # annotations are exact, so they win over text matches
+        lowered = uri.lower()
+        if lowered.startswith("mailto:") and not fields["email"]:
+            fields["email"] = uri[7:].split("?")[0]
+        elif lowered.startswith("tel:") and not fields["phone"]:
+            fields["phone"] = uri[4:]
+        elif "linkedin.com/" in lowered and not fields["linkedin"]:
+            fields["linkedin"] = _url(uri)
+        elif "github.com/" in lowered and not fields["github"]:
+            fields["github"] = _url(uri)
+        elif lowered.startswith("http") and _url(uri) not in fields["other"]:
+            fields["other"].append(_url(uri))
+    if not fields["email"]:
+        match = EMAIL_RE.search(region) or EMAIL_RE.search(resume_text)
+        fields["email"] = match.group(0) if match else ""
+    if not fields["phone"]:
+        fields["phone"] = next((p for p in map(_phone, PHONE_RE.findall(region)) if p), "")
+    if not fields["linkedin"]:
+        match = LINKEDIN_RE.search(region) or LINKEDIN_RE.search(resume_text)
+        fields["linkedin"] = _url(match.group(0)) if match else ""
+    if not fields["github"]:
+        match = GITHUB_RE.search(region)
+        fields["github"] = _url(match.group(0)) if match else ""
+    known = {fields["linkedin"], fields["github"]}
+    for match in URL_RE.findall(region):
+        url = _url(match)
+        if url not in known and url not in fields["other"] and "@" not in match:
+            fields["other"].append(url)
+    fields["name"], fields["location"] = _name_and_location(region, fields["email"])
+    confidence = (0.35 * bool(fields["email"]) + 0.25 * bool(fields["phone"]) + 0.2 * bool(fields["name"])
+                  + 0.2 * bool(fields["linkedin"] or fields["github"] or fields["location"]))
+    return {"fields": fields, "confidence": round(confidence, 2)}
+
+def _is_title(part: str) -> bool:
+    return any(word in TITLE_WORDS for word in re.findall(r"[a-zé]+", part.lower()))
+
+def _name_and_location(region: str, email: str):
+    """Name from the first name-shaped part; location from a label, or a "City, Region" part below the first (name/title) line."""
+    name = location = ""
+    labelled = LOCATION_LABEL_RE.search(region)
+    if labelled:
+        location = labelled.group(1).strip()
+    lines = [line.strip() for line in region.splitlines() if line.strip()]
+    for index, line in enumerate(lines):
+        for part in _FIELD_SEPARATORS.split(line):
+            part = part.strip()
+            if not part or "@" in part or any(c.isdigit() for c in part) or match_heading(part):
+                continue
+            head, _, rest = part.partition(",")
+            candidate = head.strip() if rest and _is_title(rest) else part  # "John Smith, Senior Software Engineer"
+            if not name and NAME_RE.match(candidate) and candidate != email and not _is_title(candidate):
+                name = candidate
+            elif (not location and index > 0 and PLACE_RE.match(part) and not _is_title(part)
+                  and not skill_matcher.find(part)):  # "Python, Java" on a header line
+                location = part
+        if name and location:
+            break
+    return name, location
+
+def contact_details(resume_id: str, resume_text: str, spans: Spans) -> Dict[str, Any]:
+    details = resume_store.get_meta(resume_id, CONTACT_META)
+    if details is None:
+        # Resumes stored before local extraction existed: text only, no link annotations.
+        details = extract_contact(resume_text, spans)
+        resume_store.put_meta(resume_id, CONTACT_META, details)
+    return details
+
+def render_contact(fields: Dict[str, Any]) -> str:
+    labels = (("name", "Name"), ("email", "Email"), ("phone", "Phone"), ("location", "Location"),
+              ("linkedin", "LinkedIn"), ("github", "GitHub"))
+    lines: List[str] = [f"{label}: {fields[key]}" for key, label in labels if fields.get(key)]
+    lines += [f"Other: {url}" for url in fields.get("other", [])]
+    return "\n".join(lines) if lines else "Not mentioned in the resume."
@@ -0,0 +1,72 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
+OPENROUTER_MODEL = "mistralai/mistral-7b-instruct"
+OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openrouter").lower()  # openrouter | openai | stub
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "http://localhost:8000/v1")  # for LLM_BACKEND=openai
+LLM_MODEL_OVERRIDE = os.getenv("LLM_MODEL", "")
+LLM_API_KEY = os.getenv("LLM_API_KEY", "")
+STUB_LLM_URL = os.getenv("STUB_LLM_URL", "http://127.0.0.1:8089/v1")
+
+class ChatBackend(ABC):
+    """Where and how the actions talk to a chat-completion model.
+
+    Subclasses turn a prompt into a request body and a response body back into
+    the answer text; transport, retries and rate limiting stay in llm_client.
+    """
+
+    name = "base"
+
+    def __init__(self, url: str, model: str, api_key: Optional[str] = None):
+        self.url = url
+        self.model = model
+        self.api_key = api_key
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    @abstractmethod
+    def build_request(self, prompt: str) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def parse_response(self, result: Dict[str, Any]) -> str:
+        ...
+
+class OpenAICompatibleBackend(ChatBackend):
+    """Any /chat/completions endpoint speaking the OpenAI schema: OpenRouter,
+    vLLM, llama.cpp server, Ollama, LM Studio, or the bundled stub server."""
+
+    name = "openai"
+
+    def build_request(self, prompt: str) -> Dict[str, Any]:
+        return {"model": self.model, "messages": [{"role": "user", "content": prompt}]}
+
+    def parse_response(self, result: Dict[str, Any]) -> str:
+        return result["choices"][0]["message"]["content"].strip()
+
+def make_backend(kind: str = LLM_BACKEND) -> ChatBackend:
+    if kind == "openrouter":
+        backend = OpenAICompatibleBackend(OPENROUTER_API_URL, LLM_MODEL_OVERRIDE or OPENROUTER_MODEL, OPENROUTER_API_KEY)
+    elif kind in ("openai", "local"):
+        backend = OpenAICompatibleBackend(f"{LLM_BASE_URL.rstrip('/')}/chat/completions",
+                                          LLM_MODEL_OVERRIDE or "local-model", LLM_API_KEY)
+    elif kind == "stub":
+        backend = OpenAICompatibleBackend(f"{STUB_LLM_URL.rstrip('/')}/chat/completions", "stub-model")
+    else:
+        raise ValueError(f"Unknown LLM_BACKEND '{kind}' (expected openrouter, openai or stub)")
+    backend.name = kind
+    return backend
+
+backend = make_backend()
+LLM_MODEL = backend.model  # part of every cache key, so switching backends never serves stale answers
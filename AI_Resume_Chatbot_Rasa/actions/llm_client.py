@@ -0,0 +1,147 @@
+import os
+import asyncio
+import hashlib
+from typing import Dict, Optional
+import httpx  # pip install httpx[http2]
+from .llm_backends import LLM_MODEL, backend
+from .prompt_budget import LLM_ANSWER_TOKENS, count_tokens
+from .rate_limit import QueueTimeout, admission, request_priority
+from .resilience import LLM_MAX_RETRIES, LLM_TURN_DEADLINE, RetryableError, backoff_delay, circuit_breaker, parse_retry_after
+from .metrics import llm_responses, llm_tokens
+
+OPENROUTER_TIMEOUT = float(os.getenv("OPENROUTER_TIMEOUT", "45"))
+OPENROUTER_MAX_CONNECTIONS = int(os.getenv("OPENROUTER_MAX_CONNECTIONS", "20"))
+OPENROUTER_MAX_KEEPALIVE = int(os.getenv("OPENROUTER_MAX_KEEPALIVE", "10"))
+
+_client: Optional[httpx.AsyncClient] = None
+_in_flight: Dict[str, "asyncio.Future[str]"] = {}  # normalized prompt + model -> running call
+_flight_priority: Dict[str, int] = {}  # most urgent priority among a running call's waiters
+counters = {"upstream_calls": 0, "coalesced_calls": 0, "prompt_tokens": 0}
+
+class LLMServiceError(Exception):
+    """Raised when the LLM call fails. The message is safe to show to the user."""
+
+def get_http_client() -> httpx.AsyncClient:
+    # One keep-alive HTTP/2 client per action server process, so repeat calls
+    # reuse open connections instead of paying a new TLS handshake each time.
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(OPENROUTER_TIMEOUT, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=OPENROUTER_MAX_CONNECTIONS,
+                max_keepalive_connections=OPENROUTER_MAX_KEEPALIVE,
+            ),
+            headers=backend.headers(),
+        )
+    return _client
+
+async def close_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+def _flight_key(prompt: str, model: str) -> str:
+    normalized = " ".join(prompt.split())
+    return hashlib.sha256(f"{model}\0{normalized}".encode("utf-8")).hexdigest()
+
+def _forget(key: str, task: "asyncio.Future[str]") -> None:
+    _in_flight.pop(key, None)
+    _flight_priority.pop(key, None)
+    if not task.cancelled():
+        task.exception()  # mark as retrieved even if every waiter went away
+
+async def request_completion(prompt: str) -> str:
+    """Single-flight: concurrent identical prompts share one upstream call and its result (or error)."""
+    key = _flight_key(prompt, LLM_MODEL)
+    priority = request_priority.get()
+    task = _in_flight.get(key)
+    if task is None:
+        _flight_priority[key] = priority
+        counters["upstream_calls"] += 1
+        prompt_tokens = count_tokens(prompt)
+        counters["prompt_tokens"] += prompt_tokens
+        llm_tokens.inc(prompt_tokens, direction="prompt")
+        task = asyncio.ensure_future(_post_completion(prompt, key))
+        _in_flight[key] = task
+        task.add_done_callback(lambda done: _forget(key, done))
+    else:
+        counters["coalesced_calls"] += 1
+        if priority < _flight_priority.get(key, priority):
+            _flight_priority[key] = priority  # an interactive caller joined a prefetch call: don't queue it behind prefetch
+            admission.promote(key, priority)
+    return await asyncio.shield(task)  # a cancelled caller must not cancel the shared call
+
+def estimate_tokens(prompt: str) -> int:
+    # prompt plus room for the answer
+    return count_tokens(prompt) + LLM_ANSWER_TOKENS // 2
+
+def llm_stats() -> Dict[str, object]:
+    return dict(counters, backend=backend.name, model=LLM_MODEL, in_flight=len(_in_flight), circuit=circuit_breaker.stats(), admission=admission.stats())
+
+async def _post_completion(prompt: str, key: Optional[str] = None) -> str:
+    """Retries transient failures with jittered backoff (honoring Retry-After) within
+    LLM_TURN_DEADLINE, and fails fast while the circuit breaker is open."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LLM_TURN_DEADLINE
+    attempt = 0
+    while True:
+        try:
+            # time spent queued counts against the turn deadline too
+            await admission.acquire(estimate_tokens(prompt), _flight_priority.get(key), max(0.0, deadline - loop.time()), key)
+        except QueueTimeout:
+            raise LLMServiceError("⏳ The AI service is busy right now. Please try again in a few seconds.")
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise LLMServiceError("⏱️ Analysis is taking longer than expected. Please try a simpler query.")
+        # Ask the breaker only once admitted, so a half-open trial is never held while queued.
+        trial = circuit_breaker.state == "half_open"
+        if not circuit_breaker.allow():
+            raise LLMServiceError("🔧 AI service temporarily unavailable. Please try again shortly.")
+        try:
+            return await _post_once(prompt, min(OPENROUTER_TIMEOUT, remaining))
+        except RetryableError as e:
+            delay = backoff_delay(attempt, e.retry_after)
+            attempt += 1
+            if attempt > LLM_MAX_RETRIES or loop.time() + delay >= deadline:
+                raise LLMServiceError(str(e))
+            print(f"{backend.name} attempt {attempt} failed ({e}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        except BaseException:
+            if trial:
+                circuit_breaker.release_trial()  # cancelled or failed before the upstream answered
+            raise
+
+async def _post_once(prompt: str, timeout: float) -> str:
+    data = backend.build_request(prompt)
+    try:
+        response = await get_http_client().post(
+            backend.url, json=data, timeout=httpx.Timeout(timeout, connect=min(10.0, timeout)))
+    except httpx.TimeoutException:
+        llm_responses.inc(status="timeout")
+        circuit_breaker.record_failure()
+        raise RetryableError("⏱️ Analysis is taking longer than expected. Please try a simpler query.")
+    except httpx.TransportError:
+        llm_responses.inc(status="transport")
+        circuit_breaker.record_failure()
+        raise RetryableError("🔌 Connection issue detected. Please check your internet connection.")
+    llm_responses.inc(status=str(response.status_code))
+    if response.status_code >= 500:
+        circuit_breaker.record_failure()
+    else:
+        circuit_breaker.record_success()  # the upstream answered, even if it said no
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if response.status_code == 429:
+        raise RetryableError("⏱️ Rate limit reached. Please wait a moment and try again.", retry_after)
+    elif response.status_code in (502, 503, 504):
+        raise RetryableError("🔧 AI service temporarily unavailable. Please try again shortly.", retry_after)
+    try:
+        response.raise_for_status()
+        answer = backend.parse_response(response.json())
+    except Exception as e:
+        print(f"Error calling {backend.name} LLM backend: {e}")
+        raise LLMServiceError("Sorry, I couldn't analyze the resume right now. Please try again.")
+    llm_tokens.inc(count_tokens(answer), direction="response")
+    return answer
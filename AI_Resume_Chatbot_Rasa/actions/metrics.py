@@ -0,0 +1,151 @@
+"""In-process latency histograms and counters, served in Prometheus text format.
+
+    curl http://localhost:5056/metrics
+
+Stages timed per action: recovery (ensure_slots_persist), pdf_parse,
+prompt_build and llm_call. The endpoint is a stdlib HTTP server thread next to
+the action server, so it needs no extra dependency; it starts with the first
+action run, not at import, so scripts importing the actions bind no port.
+"""
+import os
+import time
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", "5056"))  # 0 disables the /metrics endpoint
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")  # 0.0.0.0 to let a remote Prometheus scrape it
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+current_action: ContextVar[str] = ContextVar("current_action", default="")  # set by timed_action
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            lines += [f"{self.name}{_format_labels(k)} {v:g}" for k, v in sorted(self._values.items())]
+        return lines
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}  # labels -> (bucket counts, [sum])
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _labels(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0]))
+            counts[index] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_format_labels(key, ('le', f'{bound:g}'))} {cumulative}")
+                cumulative += counts[-1]
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', '+Inf'))} {cumulative}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {total[0]:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+action_seconds = Histogram("resume_action_duration_seconds", "Wall time of one action run, by action and outcome.")
+stage_seconds = Histogram("resume_stage_duration_seconds", "Wall time of one stage inside an action.")
+llm_responses = Counter("resume_llm_responses_total", "Upstream LLM attempts by HTTP status (or timeout/transport).")
+llm_tokens = Counter("resume_llm_tokens_total", "Estimated tokens sent to and received from the LLM.")
+cache_lookups = Counter("resume_answer_cache_total", "Answer lookups by result: local, structured, hit or miss.")
+REGISTRY = (action_seconds, stage_seconds, llm_responses, llm_tokens, cache_lookups)
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stage_seconds.observe(time.perf_counter() - start, action=current_action.get(), stage=stage)
+
+def timed_action(run):
+    """Decorator for Action.run: records the whole run in action_seconds."""
+    @functools.wraps(run)
+    async def wrapper(self, dispatcher, tracker, domain):
+        start_metrics_server()  # no-op after the first call
+        current_action.set(self.name())  # each webhook call runs in its own task context
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            events = await run(self, dispatcher, tracker, domain)
+            outcome = "ok"
+            return events
+        finally:
+            action_seconds.observe(time.perf_counter() - start, action=self.name(), outcome=outcome)
+    return wrapper
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0].rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        data = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass  # scraped every few seconds
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_tried = False
+
+def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT) -> Optional[ThreadingHTTPServer]:
+    """Serve /metrics from a daemon thread; once per process, never fatal."""
+    global _server, _server_tried
+    if _server_tried or not port:
+        return _server
+    _server_tried = True
+    try:
+        _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        print(f"Metrics endpoint disabled, cannot bind {host}:{port}: {e}")
+        return None
+    _server.daemon_threads = True
+    threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    print(f"Metrics available at http://{host}:{port}/metrics")
+    return _server
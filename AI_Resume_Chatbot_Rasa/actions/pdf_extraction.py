@@ -0,0 +1,205 @@
+import os
+import base64
+import logging
+import asyncio
+import binascii
+import fitz  # PyMuPDF
+import magic  # pip install python-magic
+import mimetypes
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+from .resume_sections import PDF_KEYWORDS, SECTIONS_META, Spans, headings_from_pdf, segment_sections
+from .resume_store import resume_store
+from .candidate_corpus import candidate_corpus
+from .contact_extraction import CONTACT_META, extract_contact
+from .resume_retrieval import CHUNKS_META, build_chunk_index
+from .text_normalize import normalization_report, normalize_line, normalize_pages
+
+PDF_MAX_BYTES = 2 * 1024 * 1024
+PDF_KEYWORD_SCAN_PAGES = int(os.getenv("PDF_KEYWORD_SCAN_PAGES", "3"))  # pages read before rejecting a non-resume
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", "30"))
+PDF_MAX_CONCURRENT_UPLOADS = int(os.getenv("PDF_MAX_CONCURRENT_UPLOADS", "8"))
+
+logger = logging.getLogger(__name__)
+
+class ExtractedResume(NamedTuple):
+    text: str  # normalized; what prompts and the resume store use
+    sections: Spans
+    error: str
+    original_text: str = ""  # raw PyMuPDF output, kept for auditing
+    links: Tuple[str, ...] = ()  # URI link annotations (mailto:, tel:, profile URLs)
+
+def _failed(error: str) -> "ExtractedResume":
+    return ExtractedResume("", {}, error)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_upload_slots: Optional[asyncio.Semaphore] = None
+
+def is_file_pdf(file_path: str) -> bool:
+    try:
+        mime_type = magic.from_file(file_path, mime=True)
+        if mime_type == "application/pdf":
+            return True
+        guess, _ = mimetypes.guess_type(file_path)
+        return guess == "application/pdf"
+    except Exception:
+        return False
+
+def extract_text_from_pdf(file_path: str) -> Tuple[str, str]:
+    result = extract_resume_from_pdf(file_path)
+    return result.text, result.error
+
+def extract_resume_from_pdf(file_path: str) -> ExtractedResume:
+    """Text, section map and error message. The file is stat'ed and read exactly once."""
+    try:
+        if os.stat(file_path).st_size > PDF_MAX_BYTES:
+            return _failed("❌ File too large. Please upload a PDF under 2MB.")
+        with open(file_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return _failed(f"❌ File not found: {file_path}")
+    return extract_resume_from_bytes(data)
+
+def extract_resume_from_bytes(data: bytes) -> ExtractedResume:
+    """Staged validation: cheap checks first, full extraction only for accepted files.
+
+    1. sniff the %PDF- header, 2. open the document once, 3. read pages lazily
+    until a resume keyword shows up (giving up after PDF_KEYWORD_SCAN_PAGES),
+    4. read the remaining pages, normalize the text, build the section map and
+    collect link annotations.
+    """
+    if len(data) > PDF_MAX_BYTES:
+        return _failed("❌ File too large. Please upload a PDF under 2MB.")
+    if not is_pdf_bytes(data):
+        return _failed("❌ Uploaded file is not a valid PDF file. Only PDF resumes are supported.")
+    try:
+        doc = fitz.open(stream=data, filetype="pdf")
+    except Exception as e:
+        return _failed(f"❌ Error extracting PDF: {e}")
+    try:
+        if doc.needs_pass:
+            return _failed("❌ The PDF is encrypted/protected and cannot be processed.")
+        if doc.page_count == 0:
+            return _failed("❌ The uploaded PDF has no pages.")
+        pages = []
+        is_resume = False
+        for page in doc:
+            page_text = page.get_text()
+            pages.append(page_text)
+            if not is_resume:
+                lowered = page_text.lower()
+                is_resume = any(k in lowered for k in PDF_KEYWORDS)
+                if not is_resume and len(pages) >= PDF_KEYWORD_SCAN_PAGES:
+                    break
+        original = "".join(pages)
+        if not is_resume:
+            if not original.strip():
+                return _failed("❌ The PDF appears empty or could not be read.")
+            return _failed("❌ This PDF does not appear to be a resume. Please upload a proper resume document.")
+        text = normalize_pages(pages)
+        headings = [(normalize_line(heading), section) for heading, section in headings_from_pdf(doc)]
+        links = tuple(link["uri"] for page in doc for link in page.get_links() if link.get("uri"))
+        sections = segment_sections(text, headings)
+        return ExtractedResume(text, sections, "", original, links)
+    except RuntimeError as e:
+        if "encrypted" in str(e).lower():
+            return _failed("❌ The PDF is encrypted/protected and cannot be processed.")
+        return _failed(f"❌ Error extracting PDF text: {e}")
+    except Exception as e:
+        return _failed(f"❌ Error extracting PDF: {e}")
+    finally:
+        doc.close()
+
+def is_pdf_bytes(data: bytes) -> bool:
+    # The spec allows a little junk before the header, so look at the first KB.
+    return b"%PDF-" in data[:1024]
+
+def store_extracted_resume(result: ExtractedResume, source: str = "") -> str:
+    """Save an accepted resume with its section map and the raw text it was normalized from,
+    and add it to the candidate corpus."""
+    resume_id = resume_store.put(result.text)
+    resume_store.put_meta(resume_id, SECTIONS_META, result.sections)
+    resume_store.put_meta(resume_id, CHUNKS_META, build_chunk_index(result.text, result.sections))
+    contact = extract_contact(result.text, result.sections, result.links)
+    resume_store.put_meta(resume_id, CONTACT_META, contact)
+    candidate_corpus.add(resume_id, result.text, contact["fields"]["name"], source, result.sections)
+    if result.original_text:
+        report = normalization_report(result.original_text, result.text)
+        resume_store.put_meta(resume_id, "original", {"text": result.original_text, "normalization": report})
+        logger.debug("Resume %s normalized: %s -> %s chars (-%s%%)", resume_id, report["original_chars"],
+                     report["normalized_chars"], report["reduction_pct"])
+    return resume_id
+
+def get_pdf_pool() -> ProcessPoolExecutor:
+    # PDF parsing is CPU-bound; keep it off the action server's event loop.
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _pool
+
+def shutdown_pdf_pool(pool: Optional[ProcessPoolExecutor] = None, terminate: bool = False) -> None:
+    """Drop the pool (or pool, if it is still the current one); terminate also kills workers stuck mid-parse."""
+    global _pool
+    pool = pool or _pool
+    if pool is None:
+        return
+    if _pool is pool:
+        _pool = None
+    # ProcessPoolExecutor has no public way to stop a running task
+    processes = list((getattr(pool, "_processes", None) or {}).values()) if terminate else []
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+
+async def extract_resume_async(file_path: str) -> ExtractedResume:
+    """extract_resume_from_pdf in the worker pool, with a per-upload timeout and a cap on concurrent uploads."""
+    return await _extract_in_pool(extract_resume_from_pdf, file_path)
+
+async def extract_resume_bytes_async(data: bytes) -> ExtractedResume:
+    """Same as extract_resume_async for a PDF that arrived in memory; nothing touches disk."""
+    return await _extract_in_pool(extract_resume_from_bytes, data)
+
+def decode_pdf_base64(payload: str) -> Tuple[bytes, str]:
+    # Clients often line-wrap base64 (MIME, 76 columns); drop whitespace so strict validation still applies.
+    payload = "".join(payload.split())
+    # Reject oversized payloads before decoding them (base64 is ~4/3 of the raw size).
+    if len(payload) > PDF_MAX_BYTES * 4 // 3 + 4:
+        return b"", "❌ File too large. Please upload a PDF under 2MB."
+    try:
+        return base64.b64decode(payload, validate=True), ""
+    except (binascii.Error, ValueError):
+        return b"", "❌ Uploaded file is not a valid PDF file. Only PDF resumes are supported."
+
+async def _extract_in_pool(extract: Callable[[Any], ExtractedResume], source: Any) -> ExtractedResume:
+    global _upload_slots
+    if _upload_slots is None:
+        _upload_slots = asyncio.Semaphore(PDF_MAX_CONCURRENT_UPLOADS)
+    current: List[Tuple[ProcessPoolExecutor, "Future[ExtractedResume]"]] = []
+
+    async def run() -> ExtractedResume:
+        async with _upload_slots:
+            while True:
+                pool = get_pdf_pool()
+                job = pool.submit(extract, source)
+                current[:] = [(pool, job)]
+                try:
+                    return await asyncio.wrap_future(job)
+                except BrokenProcessPool:
+                    if pool is _pool:
+                        raise
+                    # another upload's timeout recycled the pool under this one: run again on the fresh pool
+
+    try:
+        # The timeout also covers waiting for a free upload slot.
+        return await asyncio.wait_for(run(), timeout=PDF_EXTRACT_TIMEOUT)
+    except asyncio.TimeoutError:
+        if current and not current[0][1].cancelled():
+            # Cancelling only stops the awaiter: a worker stuck on a pathological PDF would hold its
+            # process forever, and PDF_WORKERS such files would jam every upload. Kill it.
+            shutdown_pdf_pool(current[0][0], terminate=True)
+        return _failed("⏱️ Processing the PDF took too long. Please try a smaller or simpler file.")
+    except BrokenProcessPool:
+        shutdown_pdf_pool(current[0][0])  # a worker crashed (e.g. on a malformed PDF); start fresh next time
+        return _failed("❌ Error extracting PDF: the PDF worker stopped unexpectedly.")
@@ -0,0 +1,38 @@
+import os
+import asyncio
+from typing import Awaitable, Callable, List, Optional, Set
+from .rate_limit import PRIORITY_PREFETCH, request_priority
+
+# Opt-in: answer the most-asked questions in the background right after upload.
+RESUME_PREFETCH = os.getenv("RESUME_PREFETCH", "false").lower() in ("1", "true", "yes")
+RESUME_PREFETCH_ACTIONS = [name.strip() for name in os.getenv(
+    "RESUME_PREFETCH_ACTIONS", "action_ask_skills,action_ask_experience,action_ask_education").split(",") if name.strip()]
+RESUME_PREFETCH_CONCURRENCY = int(os.getenv("RESUME_PREFETCH_CONCURRENCY", "2"))
+
+_tasks: Set[asyncio.Task] = set()  # strong refs, so running prefetches aren't garbage collected
+_slots: Optional[asyncio.Semaphore] = None
+counters = {"scheduled": 0, "completed": 0, "failed": 0}
+
+def schedule_prefetch(jobs: List[Callable[[], Awaitable[str]]]) -> None:
+    """Run jobs as background tasks, at most RESUME_PREFETCH_CONCURRENCY at a time."""
+    global _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(RESUME_PREFETCH_CONCURRENCY)
+    for job in jobs:
+        task = asyncio.ensure_future(_run(job))
+        _tasks.add(task)
+        task.add_done_callback(_tasks.discard)
+        counters["scheduled"] += 1
+
+async def _run(job: Callable[[], Awaitable[str]]) -> None:
+    request_priority.set(PRIORITY_PREFETCH)  # this task's own context: queue behind interactive calls
+    async with _slots:
+        try:
+            await job()
+            counters["completed"] += 1
+        except Exception as e:
+            counters["failed"] += 1
+            print(f"Resume prefetch failed: {e}")
+
+def stats() -> dict:
+    return dict(counters, running=len(_tasks))
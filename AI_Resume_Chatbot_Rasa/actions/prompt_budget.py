@@ -0,0 +1,73 @@
+import os
+import re
+from typing import Iterable, List, Optional, Tuple
+from .resume_sections import Spans
+
+# mistral-7b-instruct on OpenRouter; keep headroom for the instructions and the answer.
+LLM_CONTEXT_TOKENS = int(os.getenv("LLM_CONTEXT_TOKENS", "8192"))
+LLM_ANSWER_TOKENS = int(os.getenv("LLM_ANSWER_TOKENS", "1024"))
+PROMPT_INSTRUCTION_TOKENS = 512
+DEFAULT_RESUME_BUDGET = int(os.getenv(
+    "RESUME_TOKEN_BUDGET", str(LLM_CONTEXT_TOKENS - LLM_ANSWER_TOKENS - PROMPT_INSTRUCTION_TOKENS)))
+# Resume tokens each action may send; questions about one small section need far less than the default.
+ACTION_TOKEN_BUDGETS = {
+    "action_ask_contact": 800,
+    "action_ask_general": 1500,
+    "action_compare_skills": 3000,
+    "action_ask_education": 1500,
+    "action_ask_certifications": 1500,
+    "action_ask_summary": 3000,
+    "action_ask_skills": 3000,
+    "action_ask_techstack": 3000,
+}
+# When a resume is over budget, sections are dropped in this order (the ones an action needs are kept).
+DROP_ORDER = ("certifications", "projects", "contact", "header", "summary", "education", "skills", "experience")
+TRIM_MARKER = "\n[… trimmed to fit the prompt budget]"
+
+# Roughly how a BPE/SentencePiece tokenizer splits text: words, with long words cut
+# into ~4-character pieces, plus one token per punctuation mark or symbol.
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+def count_tokens(text: str) -> int:
+    return sum(1 + (len(piece) - 1) // 4 for piece in _TOKEN_RE.findall(text))
+
+def budget_for(action_name: str) -> int:
+    return min(ACTION_TOKEN_BUDGETS.get(action_name, DEFAULT_RESUME_BUDGET), DEFAULT_RESUME_BUDGET)
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    if count_tokens(text) <= budget:
+        return text
+    keep = len(text)
+    while keep > 0 and count_tokens(text[:keep]) > budget:
+        keep = int(keep * 0.9)
+    return text[:keep].rstrip() + TRIM_MARKER
+
+def trim_sections(resume_text: str, spans: Spans, budget: int, keep: Iterable[str] = ()) -> str:
+    """Drop whole sections, least relevant first, until the text fits; truncate as a last resort."""
+    pieces: List[Tuple[int, int, str]] = sorted(
+        (start, end, name) for name, ranges in spans.items() for start, end in ranges)
+    if not pieces:
+        return truncate_to_tokens(resume_text, budget)
+    keep = set(keep)
+    # later occurrences of a section go before earlier ones
+    candidates = [p for name in DROP_ORDER if name not in keep
+                  for p in sorted((p for p in pieces if p[2] == name), reverse=True)]
+    kept = list(pieces)
+    text = resume_text
+    for piece in candidates:
+        if count_tokens(text) <= budget:
+            break
+        kept.remove(piece)
+        text = "\n".join(resume_text[start:end].strip() for start, end, _ in kept)
+    return truncate_to_tokens(text, budget)
+
+def budget_resume_text(action_name: str, resume_text: str, spans: Spans, keep: Iterable[str] = (),
+                       excerpt: Optional[str] = None) -> str:
+    """The resume text (or the action's excerpt of it) cut down to the action's token budget."""
+    budget = budget_for(action_name)
+    text = excerpt if excerpt is not None else resume_text
+    if count_tokens(text) <= budget:
+        return text
+    if text != resume_text:
+        return truncate_to_tokens(text, budget)
+    return trim_sections(resume_text, spans, budget, keep)
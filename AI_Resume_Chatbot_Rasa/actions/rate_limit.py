@@ -0,0 +1,127 @@
+import os
+import heapq
+import asyncio
+import itertools
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+LLM_RATE_RPM = float(os.getenv("LLM_RATE_RPM", "60"))  # 0 disables admission control
+LLM_RATE_TPM = float(os.getenv("LLM_RATE_TPM", "100000"))
+LLM_MAX_QUEUE_WAIT = float(os.getenv("LLM_MAX_QUEUE_WAIT", "10"))
+
+# Lower runs first. Background work sets the context var so its LLM calls queue behind users.
+PRIORITY_INTERACTIVE = 0
+PRIORITY_PREFETCH = 1
+request_priority: ContextVar[int] = ContextVar("request_priority", default=PRIORITY_INTERACTIVE)
+
+class QueueTimeout(Exception):
+    """Raised when a request waited LLM_MAX_QUEUE_WAIT without being admitted."""
+
+class _Bucket:
+    def __init__(self, per_minute: float, now: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = now
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def seconds_until(self, amount: float) -> float:
+        return max(0.0, (amount - self.level) / self.rate)
+
+class AdmissionController:
+    """Token buckets for requests/min and tokens/min in front of the LLM, with a
+    priority queue so interactive actions are admitted before prefetch work."""
+
+    def __init__(self, rpm: float = LLM_RATE_RPM, tpm: float = LLM_RATE_TPM, max_wait: float = LLM_MAX_QUEUE_WAIT):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_wait = max_wait
+        self._buckets: Optional[Tuple[_Bucket, _Bucket]] = None
+        self._waiters: List[Tuple[int, int, float, "asyncio.Future[None]", Optional[str]]] = []  # (priority, seq, cost, future, key)
+        self._seq = itertools.count()
+        self._pump: Optional[asyncio.Task] = None
+        self.counters = {"admitted": 0, "queued": 0, "timed_out": 0, "max_queue_depth": 0, "wait_seconds": 0.0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.rpm > 0 and self.tpm > 0
+
+    async def acquire(self, tokens: int, priority: Optional[int] = None, timeout: Optional[float] = None,
+                      key: Optional[str] = None) -> None:
+        """Wait until admitted; QueueTimeout after max_wait (or timeout, if shorter). key lets promote() find the entry."""
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        if self._buckets is None:
+            self._buckets = (_Bucket(self.rpm, loop.time()), _Bucket(self.tpm, loop.time()))
+        cost = min(float(tokens), self.tpm)  # an oversized prompt waits for a full bucket, not forever
+        if not self._waiters and self._try_take(cost, loop.time()):
+            self.counters["admitted"] += 1
+            return
+        priority = request_priority.get() if priority is None else priority
+        future = loop.create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), cost, future, key))
+        self.counters["queued"] += 1
+        self.counters["max_queue_depth"] = max(self.counters["max_queue_depth"], len(self._waiters))
+        if self._pump is None or self._pump.done():
+            self._pump = asyncio.ensure_future(self._run_pump())
+        start = loop.time()
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=self.max_wait if timeout is None else min(self.max_wait, timeout))
+        except asyncio.TimeoutError:
+            future.cancel()  # the pump skips cancelled entries
+            self.counters["timed_out"] += 1
+            raise QueueTimeout()
+        finally:
+            self.counters["wait_seconds"] += loop.time() - start
+        self.counters["admitted"] += 1
+
+    def promote(self, key: str, priority: int) -> None:
+        """Move queued entries for key up to priority, e.g. when an interactive caller joins a prefetch call."""
+        changed = False
+        for i, (old, seq, cost, future, entry_key) in enumerate(self._waiters):
+            if entry_key == key and priority < old:
+                self._waiters[i] = (priority, seq, cost, future, entry_key)
+                changed = True
+        if changed:
+            heapq.heapify(self._waiters)
+
+    def _try_take(self, cost: float, now: float) -> bool:
+        requests, tokens = self._buckets
+        requests.refill(now)
+        tokens.refill(now)
+        if requests.level >= 1 and tokens.level >= cost:
+            requests.level -= 1
+            tokens.level -= cost
+            return True
+        return False
+
+    async def _run_pump(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._waiters:
+            _, _, cost, future, _ = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._try_take(cost, loop.time()):
+                heapq.heappop(self._waiters)
+                future.set_result(None)
+                continue
+            requests, tokens = self._buckets
+            await asyncio.sleep(max(requests.seconds_until(1), tokens.seconds_until(cost), 0.01))
+
+    def stats(self) -> Dict[str, float]:
+        waited = self.counters["queued"]
+        return {
+            "queue_depth": sum(1 for _, _, _, f, _ in self._waiters if not f.done()),
+            "max_queue_depth": self.counters["max_queue_depth"],
+            "admitted": self.counters["admitted"],
+            "queued": waited,
+            "timed_out": self.counters["timed_out"],
+            "avg_wait_ms": round(1000 * self.counters["wait_seconds"] / waited, 1) if waited else 0,
+        }
+
+admission = AdmissionController()
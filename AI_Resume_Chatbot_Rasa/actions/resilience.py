@@ -0,0 +1,100 @@
+import os
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.getenv("LLM_BACKOFF_MAX", "8"))
+LLM_TURN_DEADLINE = float(os.getenv("LLM_TURN_DEADLINE", "60"))  # total seconds one user turn may spend on the LLM
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", "30"))
+
+class RetryableError(Exception):
+    """A failed attempt worth retrying; carries the user-facing message and any Retry-After hint."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds; the header may be a number of seconds or an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    # Full jitter, so clients that failed together don't retry together.
+    delay = random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** attempt))
+    if retry_after is not None:
+        delay = retry_after + delay / 4
+    return delay
+
+class CircuitBreaker:
+    """Fails fast while the upstream looks down.
+
+    closed -> open after CIRCUIT_FAILURE_THRESHOLD consecutive failures; after
+    CIRCUIT_RESET_SECONDS one trial call is let through (half-open), and its
+    outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD, reset_seconds: float = CIRCUIT_RESET_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+        self.counters = {"opened": 0, "rejected": 0}
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self._opened_at >= self.reset_seconds else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            self.counters["rejected"] += 1
+            return False
+
+    def release_trial(self) -> None:
+        """The half-open trial ended without an upstream answer (cancelled, or never sent): let another caller try."""
+        with self._lock:
+            self._trial_running = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    self.counters["opened"] += 1
+                self._opened_at = time.monotonic()
+                self._trial_running = False
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            return dict(self.counters, state=self.state, consecutive_failures=self._failures)
+
+circuit_breaker = CircuitBreaker()
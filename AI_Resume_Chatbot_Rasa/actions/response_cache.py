@@ -0,0 +1,96 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", str(24 * 3600)))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+RESPONSE_CACHE_DB = os.getenv("RESPONSE_CACHE_DB", "")  # empty disables the SQLite tier
+
+def make_cache_key(resume_text: str, action_name: str, template_version: str, model: str, variant: str = "") -> str:
+    resume_hash = hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+    # variant carries anything else the prompt depends on, e.g. the user's question.
+    variant_hash = hashlib.sha256(variant.encode("utf-8")).hexdigest() if variant else ""
+    return "|".join((resume_hash, action_name, template_version, model, variant_hash))
+
+class ResponseCache:
+    """Two-tier cache for LLM answers: an in-memory LRU with TTL and a size
+    budget, backed by an optional SQLite file that survives restarts."""
+
+    def __init__(self, ttl: float = RESPONSE_CACHE_TTL, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 max_bytes: int = RESPONSE_CACHE_MAX_BYTES, db_path: str = RESPONSE_CACHE_DB):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.counters["memory_hits"] += 1
+                    return value
+                self._drop(key)
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] > now:
+                    self._store(key, row[0], row[1])
+                    self.counters["disk_hits"] += 1
+                    return row[0]
+            self.counters["misses"] += 1
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._store(key, value, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, value, expires_at),
+                )
+                self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (time.time(),))
+                self._db.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            lookups = self.counters["memory_hits"] + self.counters["disk_hits"] + self.counters["misses"]
+            hits = lookups - self.counters["misses"]
+            return dict(self.counters, entries=len(self._entries), bytes=self._bytes,
+                        hit_rate_pct=round(100 * hits / lookups) if lookups else 0)
+
+    def _store(self, key: str, value: str, expires_at: float) -> None:
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (value, expires_at)
+        self._bytes += len(value.encode("utf-8"))
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.counters["evictions"] += 1
+
+    def _drop(self, key: str) -> None:
+        value, _ = self._entries.pop(key)
+        self._bytes -= len(value.encode("utf-8"))
+
+response_cache = ResponseCache()
@@ -0,0 +1,126 @@
+import os
+import re
+import json
+from typing import Any, Dict, List, Optional
+from .llm_client import LLM_MODEL, LLMServiceError, request_completion
+from .response_cache import make_cache_key, response_cache
+from .prompt_budget import DEFAULT_RESUME_BUDGET, count_tokens, trim_sections
+from .resume_sections import segment_sections
+
+# "Analyze once": one structured LLM call at upload, then Ask* actions answer locally.
+RESUME_ANALYZE_ONCE = os.getenv("RESUME_ANALYZE_ONCE", "false").lower() in ("1", "true", "yes")
+STRUCTURED_PROMPT_VERSION = "1"
+STRUCTURED_ACTION_NAME = "resume_structured_analysis"
+
+# field -> JSON type the model must return for it
+STRUCTURED_FIELDS = {
+    "skills": dict,
+    "summary": str,
+    "experience": list,
+    "techstack": dict,
+    "education": list,
+    "contact": dict,
+    "projects": list,
+    "certifications": list,
+}
+
+def build_structured_prompt(resume_text: str) -> str:
+    if count_tokens(resume_text) > DEFAULT_RESUME_BUDGET:
+        resume_text = trim_sections(resume_text, segment_sections(resume_text), DEFAULT_RESUME_BUDGET,
+                                    keep=("experience", "skills", "education"))
+    return (
+        "Read the resume below and return ONE JSON object and nothing else (no markdown, no comments).\n"
+        "Use exactly these keys:\n"
+        '- "skills": object mapping each skill category written in the resume (or "Technical Skills"/"Soft Skills" if uncategorized) to a list of skills, only from the Skills section(s)\n'
+        '- "summary": string, the summary/profile/objective as written, or a concise summary based only on the resume\n'
+        '- "experience": list of {"title", "company", "duration", "responsibilities": [..]}, most recent first, only from Work Experience\n'
+        '- "techstack": object with keys "Programming Languages", "Frameworks/Libraries", "Databases", "Tools", "Platforms/Cloud", each a list, only from the Skills section\n'
+        '- "education": list of {"degree", "institution", "graduation_year", "cgpa"}\n'
+        '- "contact": object with "name", "email", "phone", "location", "linkedin", "other"\n'
+        '- "projects": list of {"name", "description", "technologies", "duration", "outcomes"}, only from the Projects section\n'
+        '- "certifications": list of certification/award/achievement names exactly as written\n'
+        "❌ Do not assume, infer or add anything not explicitly written. Use \"\" or [] when something is not mentioned.\n\n"
+        f"Resume text:\n{resume_text}"
+    )
+
+def parse_structured_response(raw: str) -> Optional[Dict[str, Any]]:
+    # Models often wrap JSON in ``` fences or add a sentence around it.
+    match = re.search(r"\{.*\}", raw, re.DOTALL)
+    if not match:
+        return None
+    try:
+        doc = json.loads(match.group(0))
+    except ValueError:
+        return None
+    if not isinstance(doc, dict) or not any(field in doc for field in STRUCTURED_FIELDS):
+        return None
+    validated = {}
+    for field, expected in STRUCTURED_FIELDS.items():
+        value = doc.get(field)
+        if value in (None, ""):
+            value = expected()
+        if not isinstance(value, expected):
+            return None
+        validated[field] = value
+    return validated
+
+def _cache_key(resume_text: str) -> str:
+    return make_cache_key(resume_text, STRUCTURED_ACTION_NAME, STRUCTURED_PROMPT_VERSION, LLM_MODEL)
+
+def get_cached_analysis(resume_text: str) -> Optional[Dict[str, Any]]:
+    cached = response_cache.get(_cache_key(resume_text))
+    return json.loads(cached) if cached is not None else None
+
+async def analyze_resume_structured(resume_text: str) -> Optional[Dict[str, Any]]:
+    doc = get_cached_analysis(resume_text)
+    if doc is not None:
+        return doc
+    try:
+        raw = await request_completion(build_structured_prompt(resume_text))
+    except LLMServiceError as e:
+        print(f"Structured resume analysis failed: {e}")
+        return None
+    doc = parse_structured_response(raw)
+    if doc is None:
+        print("Structured resume analysis returned invalid JSON; falling back to per-question prompts.")
+        return None
+    response_cache.set(_cache_key(resume_text), json.dumps(doc))
+    return doc
+
+def _label(key: str) -> str:
+    return key.replace("_", " ").strip().title() if key.islower() else key
+
+def _render(value: Any, indent: str = "") -> List[str]:
+    lines: List[str] = []
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if item in (None, "", [], {}):
+                continue
+            if isinstance(item, (dict, list)):
+                lines.append(f"{indent}{_label(key)}:")
+                lines.extend(_render(item, indent + "  "))
+            else:
+                lines.append(f"{indent}{_label(key)}: {item}")
+    elif isinstance(value, list):
+        for item in value:
+            if isinstance(item, dict):
+                item_lines = _render(item, indent + "  ")
+                if item_lines:
+                    lines.append(f"{indent}- {item_lines[0].strip()}")
+                    lines.extend(item_lines[1:])
+            elif item not in (None, ""):
+                lines.append(f"{indent}- {item}")
+    elif value not in (None, ""):
+        lines.append(f"{indent}{value}")
+    return lines
+
+def render_section(doc: Dict[str, Any], field: str) -> str:
+    lines = _render(doc.get(field))
+    return "\n".join(lines) if lines else "Not mentioned in the resume."
+
+def cached_section_answer(resume_text: str, field: str) -> Optional[str]:
+    """Answer from the upload-time structured analysis, or None to use the LLM prompt."""
+    if not RESUME_ANALYZE_ONCE:
+        return None
+    doc = get_cached_analysis(resume_text)
+    return render_section(doc, field) if doc is not None else None
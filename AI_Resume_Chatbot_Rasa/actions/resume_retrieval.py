@@ -0,0 +1,112 @@
+import os
+import re
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from .prompt_budget import count_tokens, truncate_to_tokens
+from .resume_sections import Spans
+from .resume_store import resume_store
+
+RETRIEVAL_CHUNK_TOKENS = int(os.getenv("RETRIEVAL_CHUNK_TOKENS", "120"))
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "4"))
+CHUNKS_META = "chunks"
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Question words carry no signal about *where* in the resume the answer is.
+STOPWORDS = frozenset("""a an and are as at be by can candidate candidates did do does for from has have he her his how
+i in is it its me of on or resume she tell that the their them they this to was were what when where which who
+why will with you your about any there please give list show""".split())
+# Question words that point at a section; the section name is indexed with every chunk of it.
+QUERY_EXPANSIONS = {
+    "education": ("university", "college", "degree", "school", "graduate", "graduated", "study", "studied", "gpa", "cgpa"),
+    "experience": ("job", "work", "worked", "company", "employer", "role", "position", "career"),
+    "skills": ("skill", "technology", "tool", "language", "framework", "know"),
+    "contact header": ("email", "phone", "contact", "reach", "linkedin", "address", "location", "github"),
+    "certifications": ("certified", "certificate", "award", "achievement"),
+    "projects": ("project", "built"),
+}
+_EXPANSIONS = {word: tuple(sections.split()) for sections, words in QUERY_EXPANSIONS.items() for word in words}
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")  # keeps c++, c#, node.js, b.tech
+_POSSESSIVE_RE = re.compile(r"['’]s\b")
+
+def tokenize(text: str) -> List[str]:
+    terms = []
+    for word in _WORD_RE.findall(_POSSESSIVE_RE.sub("", text.lower())):  # "candidate's" is not "candidate" + "s"
+        if word in STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss") and word.isalpha():
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+def chunk_resume(resume_text: str, spans: Spans, chunk_tokens: int = RETRIEVAL_CHUNK_TOKENS) -> List[List]:
+    """Split each section into [start, end, section] chunks of about chunk_tokens, on line boundaries."""
+    pieces = sorted((start, end, name) for name, ranges in spans.items() for start, end in ranges)
+    if not pieces:
+        pieces = [(0, len(resume_text), "body")]
+    chunks = []
+    for start, end, section in pieces:
+        chunk_start = start
+        tokens = 0
+        for line in re.finditer(r"[^\n]*\n?", resume_text[start:end]):
+            tokens += count_tokens(line.group())
+            line_end = start + line.end()
+            if tokens >= chunk_tokens:
+                chunks.append([chunk_start, line_end, section])
+                chunk_start, tokens = line_end, 0
+        if resume_text[chunk_start:end].strip():
+            chunks.append([chunk_start, end, section])
+    return chunks
+
+def build_chunk_index(resume_text: str, spans: Spans) -> Dict[str, list]:
+    """Chunks plus their term frequencies; the section name is indexed with each chunk."""
+    chunks = chunk_resume(resume_text, spans)
+    terms = [dict(Counter(tokenize(resume_text[start:end]) + tokenize(section))) for start, end, section in chunks]
+    return {"chunks": chunks, "terms": terms}
+
+def chunk_index(resume_id: str, resume_text: str, spans: Spans) -> Dict[str, list]:
+    index = resume_store.get_meta(resume_id, CHUNKS_META)
+    if index is None:
+        # Resumes stored before retrieval existed are indexed on first question.
+        index = build_chunk_index(resume_text, spans)
+        resume_store.put_meta(resume_id, CHUNKS_META, index)
+    return index
+
+def bm25_scores(index: Dict[str, list], query_terms: List[str]) -> List[float]:
+    terms = index["terms"]
+    lengths = [sum(tf.values()) for tf in terms]
+    n = len(terms)
+    avg_length = (sum(lengths) / n) if n else 0.0
+    scores = [0.0] * n
+    for term in set(query_terms):
+        df = sum(1 for tf in terms if term in tf)
+        if not df:
+            continue
+        idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+        for i, tf in enumerate(terms):
+            f = tf.get(term)
+            if f:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[i] / (avg_length or 1))
+                scores[i] += idf * f * (BM25_K1 + 1) / (f + norm)
+    return scores
+
+def retrieve_chunks(resume_id: str, resume_text: str, spans: Spans, question: str,
+                    top_k: int = RETRIEVAL_TOP_K) -> List[Tuple[float, int, int, str]]:
+    """Best matching chunks as (score, start, end, section), best first; empty if nothing matches."""
+    index = chunk_index(resume_id, resume_text, spans)
+    terms = tokenize(question)
+    terms += tokenize(" ".join(section for term in terms for section in _EXPANSIONS.get(term, ())))
+    scores = bm25_scores(index, terms)
+    ranked = sorted(((s, *chunk) for s, chunk in zip(scores, index["chunks"]) if s > 0), key=lambda hit: -hit[0])
+    return [tuple(hit) for hit in ranked[:top_k]]
+
+def retrieval_context(resume_id: str, resume_text: str, spans: Spans, question: str, budget: int) -> Optional[str]:
+    """Retrieved chunks in resume order, within budget tokens, or None if the question matched nothing."""
+    hits = retrieve_chunks(resume_id, resume_text, spans, question)
+    if not hits:
+        return None
+    parts = [f"[{section}]\n{resume_text[start:end].strip()}" for _, start, end, section in sorted(hits, key=lambda h: h[1])]
+    return truncate_to_tokens("\n\n".join(parts), budget)
@@ -0,0 +1,126 @@
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from .resume_store import resume_store
+
+PDF_KEYWORDS = ["education", "experience", "skills", "project", "summary", "profile", "certification"]
+
+# section -> heading words; built around PDF_KEYWORDS plus their usual synonyms
+SECTION_HEADINGS = {
+    "summary": ("summary", "profile", "objective", "about me"),
+    "experience": ("experience", "employment", "work history", "internship"),
+    "education": ("education", "academic", "qualification"),
+    "skills": ("skill", "technologies", "competencies", "expertise"),
+    "projects": ("project",),
+    "certifications": ("certification", "award", "achievement", "license", "licence", "honor", "honour"),
+    "contact": ("contact", "personal details", "personal information"),
+}
+# what each action sends to the LLM; "header" is everything above the first heading
+ACTION_SECTIONS = {
+    "skills": ("skills",),
+    "techstack": ("skills",),
+    "summary": ("summary",),
+    "experience": ("experience",),
+    "education": ("education",),
+    "projects": ("projects",),
+    "certifications": ("certifications",),
+    "contact": ("header", "contact"),
+}
+COMPARE_SECTIONS = ("skills", "experience", "projects")  # where a resume claims skills
+SECTIONS_META = "sections"
+BOLD_FLAG = 1 << 4  # PyMuPDF span flag
+
+_QUALIFIERS = r"(?:(?:work|professional|technical|key|core|relevant|academic|personal|career|other|notable|selected|soft)\s+)?"
+_HEADING_PATTERNS = [
+    (section, re.compile(rf"^{_QUALIFIERS}(?:{'|'.join(re.escape(w) for w in words)})\w*\b[\w\s&/,-]{{0,30}}$"))
+    for section, words in SECTION_HEADINGS.items()
+]
+Spans = Dict[str, List[List[int]]]
+
+def match_heading(line: str) -> Optional[str]:
+    normalized = re.sub(r"[\s:|•\-–]+$", "", line.strip().lower())
+    if not normalized or len(normalized.split()) > 4:
+        return None
+    for section, pattern in _HEADING_PATTERNS:
+        if pattern.match(normalized):
+            return section
+    return None
+
+def headings_from_pdf(doc) -> List[Tuple[str, str]]:
+    """Heading lines in reading order, using font size and bold cues from get_text("dict")."""
+    lines = []
+    sizes: Counter = Counter()
+    for page in doc:
+        for block in page.get_text("dict")["blocks"]:
+            for line in block.get("lines", []):
+                spans = [s for s in line["spans"] if s["text"].strip()]
+                if not spans:
+                    continue
+                text = "".join(s["text"] for s in spans).strip()
+                size = max(s["size"] for s in spans)
+                bold = all(s["flags"] & BOLD_FLAG or "bold" in s["font"].lower() for s in spans)
+                lines.append((text, size, bold))
+                for s in spans:
+                    sizes[round(s["size"], 1)] += len(s["text"])
+    body_size = sizes.most_common(1)[0][0] if sizes else 0
+    headings = []
+    for text, size, bold in lines:
+        emphasized = bold or size >= body_size + 1 or text.isupper()
+        section = match_heading(text) if emphasized else None
+        if section:
+            headings.append((text, section))
+    return headings
+
+def headings_from_text(text: str) -> List[Tuple[str, str]]:
+    """Plain-text fallback: short keyword lines that look like headings (CAPS, Title Case or a trailing colon)."""
+    headings = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped and (stripped.isupper() or stripped.istitle() or stripped.endswith(":")):
+            section = match_heading(stripped)
+            if section:
+                headings.append((stripped, section))
+    return headings
+
+def segment_sections(text: str, headings: Optional[Iterable[Tuple[str, str]]] = None) -> Spans:
+    """Map each section to [start, end] character ranges of text, one per heading found."""
+    if headings is None:
+        headings = headings_from_text(text)
+    marks = []
+    cursor = 0
+    for heading, section in headings:
+        # whole lines only, so "Experience" inside a body sentence doesn't split a section
+        found = re.compile(rf"^[ \t]*{re.escape(heading)}[ \t:]*$", re.MULTILINE).search(text, cursor)
+        if found is None:
+            continue
+        marks.append((found.start(), section))
+        cursor = found.end()
+    spans: Spans = {}
+    if marks and marks[0][0] > 0:
+        spans["header"] = [[0, marks[0][0]]]
+    for i, (start, section) in enumerate(marks):
+        end = marks[i + 1][0] if i + 1 < len(marks) else len(text)
+        spans.setdefault(section, []).append([start, end])
+    return spans
+
+def section_spans(resume_id: str, resume_text: str) -> Spans:
+    spans = resume_store.get_meta(resume_id, SECTIONS_META)
+    if spans is None:
+        # Resumes stored before segmentation existed: fall back to the text heuristics once.
+        spans = segment_sections(resume_text)
+        resume_store.put_meta(resume_id, SECTIONS_META, spans)
+    return spans
+
+def claimed_text(resume_text: str, spans: Spans) -> str:
+    """Text of the sections where skills are claimed: "Spring 2020" in education or "Excel in teamwork" in a summary are not skills."""
+    claimed = "\n".join(resume_text[start:end] for name in COMPARE_SECTIONS for start, end in spans.get(name, []))
+    return claimed or resume_text
+
+def section_text(resume_id: str, resume_text: str, section: str) -> str:
+    """The slice of the resume an action needs, or the full text if the section wasn't found."""
+    spans = section_spans(resume_id, resume_text)
+    parts = [resume_text[start:end].strip()
+             for name in ACTION_SECTIONS.get(section, (section,))
+             for start, end in spans.get(name, [])]
+    sliced = "\n\n".join(p for p in parts if p)
+    return sliced or resume_text
@@ -0,0 +1,121 @@
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from .resume_sections import Spans, match_heading
+from .skill_taxonomy import skill_matcher
+
+MONTHS = {name: i + 1 for i, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"))}
+# whole words only: "Octopus" and "summary" are not October and March
+_MONTH = (r"\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+          r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b\.?")
+_YEAR = r"(?:19|20)\d{2}"
+
+def _date(p: str) -> str:
+    """Pattern for a "Jan 2019", "01/2019" or "2019" date, with group names prefixed by p."""
+    return (rf"(?:(?P<{p}month>{_MONTH})\s*,?\s*(?P<{p}year>{_YEAR})"
+            rf"|(?P<{p}mm>0?[1-9]|1[0-2])\s*/\s*(?P<{p}myear>{_YEAR})|(?P<{p}yonly>{_YEAR}))")
+
+DATE_RANGE_RE = re.compile(
+    rf"(?<!\d){_date('s')}\s*(?:-|–|—|to|till|until)\s*"
+    rf"(?:(?P<present>present|current|now|ongoing|till date|to date)|{_date('e')})(?!\d)",
+    re.IGNORECASE)
+# highest first; matched against education lines
+DEGREE_LEVELS = (
+    ("Doctorate", re.compile(r"\b(?:ph\.?\s?d|doctor(?:ate)?)\b", re.IGNORECASE)),
+    ("Master's", re.compile(r"\b(?:master'?s?|m\.?\s?tech|m\.?\s?sc|m\.?\s?s|m\.?\s?e|mba|m\.?\s?a|mca|m\.?\s?eng)\b", re.IGNORECASE)),
+    ("Bachelor's", re.compile(r"\b(?:bachelor'?s?|b\.?\s?tech|b\.?\s?sc|b\.?\s?e|b\.?\s?s|b\.?\s?a|bca|b\.?\s?com|b\.?\s?eng)\b", re.IGNORECASE)),
+    ("Diploma", re.compile(r"\bdiploma\b", re.IGNORECASE)),
+    ("High school", re.compile(r"\b(?:high school|secondary|hsc|ssc|12th|10th|intermediate)\b", re.IGNORECASE)),
+)
+_LIST_SEPARATORS = re.compile(r"\s*[,;|•·▪◦]\s*")
+
+def _month_index(match, prefix: str, is_end: bool) -> Optional[int]:
+    """Months since year 0; year-only ends count up to January of that year."""
+    if match.group(f"{prefix}month"):
+        return int(match.group(f"{prefix}year")) * 12 + MONTHS[match.group(f"{prefix}month")[:3].lower()] - 1 + is_end
+    if match.group(f"{prefix}mm"):
+        return int(match.group(f"{prefix}myear")) * 12 + int(match.group(f"{prefix}mm")) - 1 + is_end
+    if match.group(f"{prefix}yonly"):
+        return int(match.group(f"{prefix}yonly")) * 12
+    return None
+
+def parse_date_ranges(text: str, today: Optional[date] = None) -> List[Tuple[int, int]]:
+    """Half-open [start, end) month intervals for every "Jan 2019 – Present" / "2018-2021" style range."""
+    today = today or date.today()
+    now = today.year * 12 + today.month  # through the current month
+    ranges = []
+    for match in DATE_RANGE_RE.finditer(text):
+        start = _month_index(match, "s", False)
+        end = now if match.group("present") else _month_index(match, "e", True)
+        if start is None or end is None:
+            continue
+        end = min(end, now)  # "Jan 2025 - Dec 2026" on a current role: count it through this month
+        if start < end:
+            ranges.append((start, end))
+    return ranges
+
+def merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[List[int]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, end) for start, end in merged]
+
+def listed_skills(skills_text: str) -> List[str]:
+    """Items of the skills section(s), aliases folded into one canonical name (k8s = Kubernetes)."""
+    seen: Dict[str, str] = {}
+    for line in skills_text.splitlines():
+        if match_heading(line):
+            continue
+        line = re.sub(r"^[^:]{1,40}:\s*", "", line.strip().lstrip("-*• "))
+        for item in _LIST_SEPARATORS.split(line):
+            item = item.strip(" .()")
+            if not item or len(item) > 40 or len(item.split()) > 4:
+                continue
+            found = skill_matcher.find(item)
+            key = found[0] if len(found) == 1 else item.lower()
+            seen.setdefault(key, found[0] if len(found) == 1 else item)
+    return list(seen.values())
+
+def highest_education(education_text: str) -> Optional[Tuple[str, str]]:
+    lines = [line.strip() for line in education_text.splitlines() if line.strip() and not match_heading(line)]
+    for level, pattern in DEGREE_LEVELS:
+        for i, line in enumerate(lines):
+            if pattern.search(line):
+                # institution and year are usually on the same or the next line
+                detail = line if re.search(r"(?:19|20)\d{2}", line) or i + 1 >= len(lines) else f"{line}, {lines[i + 1]}"
+                return level, detail
+    return None
+
+def _section(resume_text: str, spans: Spans, name: str) -> str:
+    return "\n".join(resume_text[start:end] for start, end in spans.get(name, []))
+
+def resume_stats(resume_text: str, spans: Spans, today: Optional[date] = None) -> Dict[str, Any]:
+    experience = _section(resume_text, spans, "experience")
+    ranges = parse_date_ranges(experience, today)
+    months = sum(end - start for start, end in merge_ranges(ranges))
+    return {
+        "experience_months": months if ranges else None,
+        "positions": len(ranges) if ranges else None,
+        "unique_skills": len(listed_skills(_section(resume_text, spans, "skills"))) if "skills" in spans else None,
+        "education": highest_education(_section(resume_text, spans, "education")) if "education" in spans else None,
+        "word_count": len(resume_text.split()),
+        "char_count": len(resume_text),
+    }
+
+def render_stats(stats: Dict[str, Any]) -> str:
+    missing = "Not found in the resume"
+    months = stats["experience_months"]
+    years = f"{months / 12:.1f} years ({months // 12} years {months % 12} months, overlapping roles counted once)" \
+        if months is not None else missing
+    education = f"{stats['education'][0]} — {stats['education'][1]}" if stats["education"] else missing
+    return "\n".join((
+        f"Total Years of Experience: {years}",
+        f"Number of Jobs/Positions Held: {stats['positions'] if stats['positions'] is not None else missing}",
+        f"Total Number of Unique Skills Mentioned: {stats['unique_skills'] if stats['unique_skills'] is not None else missing}",
+        f"Highest Education Level: {education}",
+        f"Length: {stats['word_count']} words, {stats['char_count']} characters",
+    ))
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+RESUME_STORE_DIR = os.getenv("RESUME_STORE_DIR", ".resume_store")
+RESUME_STORE_CACHE_ENTRIES = int(os.getenv("RESUME_STORE_CACHE_ENTRIES", "64"))
+RESUME_INDEX_MAX_CONVERSATIONS = int(os.getenv("RESUME_INDEX_MAX_CONVERSATIONS", "10000"))
+
+def resume_id_for(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:24]
+
+class ResumeStore:
+    """Content-addressed, zlib-compressed resume texts on the local filesystem.
+
+    Only the short resume id travels in the tracker; the text is written once
+    per distinct resume and read back on demand.
+    """
+
+    def __init__(self, root: str = RESUME_STORE_DIR, cache_entries: int = RESUME_STORE_CACHE_ENTRIES):
+        self.root = root
+        self.cache_entries = cache_entries
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, resume_id: str, suffix: str = "txt") -> str:
+        return os.path.join(self.root, resume_id[:2], f"{resume_id}.{suffix}.z")
+
+    def _write(self, path: str, data: str) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(data.encode("utf-8"), 6))
+        os.replace(tmp_path, path)  # atomic, so readers never see a partial file
+
+    def put(self, text: str) -> str:
+        resume_id = resume_id_for(text)
+        path = self._path(resume_id)
+        if not os.path.exists(path):
+            self._write(path, text)
+        self._remember(resume_id, text)
+        return resume_id
+
+    def get(self, resume_id: str) -> Optional[str]:
+        if not resume_id:
+            return None
+        return self._read(resume_id, self._path(resume_id))
+
+    def put_meta(self, resume_id: str, name: str, value: Any) -> None:
+        """Store derived data (e.g. the section map) next to the resume it was computed from."""
+        data = json.dumps(value)
+        self._write(self._path(resume_id, name), data)
+        self._remember(f"{resume_id}.{name}", data)
+
+    def get_meta(self, resume_id: str, name: str) -> Optional[Any]:
+        if not resume_id:
+            return None
+        data = self._read(f"{resume_id}.{name}", self._path(resume_id, name))
+        return json.loads(data) if data is not None else None
+
+    def _read(self, key: str, path: str) -> Optional[str]:
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+                return data
+        try:
+            with open(path, "rb") as f:
+                data = zlib.decompress(f.read()).decode("utf-8")
+        except (OSError, zlib.error, ValueError):
+            return None
+        self._remember(key, data)
+        return data
+
+    def _remember(self, key: str, data: str) -> None:
+        with self._lock:
+            self._cache[key] = data
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_entries:
+                self._cache.popitem(last=False)
+
+class ConversationResumeIndex:
+    """Latest resume id per conversation (sender_id), kept in the action server.
+
+    Lets ensure_slots_persist recover a resume with one dict lookup instead of
+    scanning tracker.events; the scan is only needed after a server restart.
+    """
+
+    def __init__(self, max_conversations: int = RESUME_INDEX_MAX_CONVERSATIONS):
+        self.max_conversations = max_conversations
+        self._latest: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.timings = {"index_lookups": 0, "index_hits": 0, "index_seconds": 0.0,
+                        "event_scans": 0, "events_scanned": 0, "scan_seconds": 0.0}
+
+    def record(self, sender_id: str, resume_id: str) -> None:
+        with self._lock:
+            self._latest[sender_id] = resume_id
+            self._latest.move_to_end(sender_id)
+            while len(self._latest) > self.max_conversations:
+                self._latest.popitem(last=False)
+
+    def lookup(self, sender_id: str) -> Optional[str]:
+        start = time.perf_counter()
+        with self._lock:
+            resume_id = self._latest.get(sender_id)
+            self.timings["index_lookups"] += 1
+            self.timings["index_hits"] += resume_id is not None
+            self.timings["index_seconds"] += time.perf_counter() - start
+        return resume_id
+
+    def record_scan(self, events_scanned: int, seconds: float) -> None:
+        with self._lock:
+            self.timings["event_scans"] += 1
+            self.timings["events_scanned"] += events_scanned
+            self.timings["scan_seconds"] += seconds
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            t = self.timings
+            return {
+                "conversations": len(self._latest),
+                "index_lookups": t["index_lookups"],
+                "index_hits": t["index_hits"],
+                "index_avg_us": round(1e6 * t["index_seconds"] / t["index_lookups"], 2) if t["index_lookups"] else 0,
+                "event_scans": t["event_scans"],
+                "events_scanned": t["events_scanned"],
+                "scan_avg_us": round(1e6 * t["scan_seconds"] / t["event_scans"], 2) if t["event_scans"] else 0,
+            }
+
+resume_store = ResumeStore()
+resume_index = ConversationResumeIndex()
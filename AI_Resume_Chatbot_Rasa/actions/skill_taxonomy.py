@@ -0,0 +1,149 @@
+import re
+from collections import deque
+from typing import Dict, List, Tuple
+
+# category -> canonical skill -> extra aliases (the canonical name always matches too).
+# Categories follow the techstack prompt, so local and LLM answers look the same.
+SKILL_TAXONOMY: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "Programming Languages": {
+        "Python": ("py", "python3"), "Java": (), "JavaScript": ("js", "ecmascript", "es6"),
+        "TypeScript": ("TS",), "C": (), "C++": ("cpp",), "C#": ("c sharp", "csharp"), "Go": ("golang",),
+        "Rust": (), "Ruby": (), "PHP": (), "Kotlin": (), "Swift": (), "Scala": (), "R": (), "MATLAB": (),
+        "Perl": (), "Dart": (), "Bash": ("shell scripting",), "SQL": (), "HTML": ("html5",),
+        "CSS": ("css3",), "Solidity": (), "Haskell": (), "Elixir": (), "Lua": (), "Julia": (),
+    },
+    "Frameworks/Libraries": {
+        "React": ("react.js", "reactjs"), "Angular": ("angularjs", "angular.js"), "Vue.js": ("vue", "vuejs"),
+        "Next.js": ("nextjs",), "Node.js": ("Node", "nodejs"), "Express": ("express.js", "expressjs"),
+        "Django": (), "Flask": (), "FastAPI": (), "Spring Boot": ("Spring", "springboot"), "Rails": ("ruby on rails", "ror"),
+        "Laravel": (), ".NET": ("dotnet", "asp.net", ".net core"), "TensorFlow": ("TF",), "PyTorch": (),
+        "Keras": (), "scikit-learn": ("sklearn", "scikit learn"), "Pandas": (), "NumPy": (), "Spark": ("apache spark", "pyspark"),
+        "Hadoop": (), "Kafka": ("apache kafka",), "Rasa": (), "Hugging Face": ("huggingface", "transformers"),
+        "LangChain": (), "OpenCV": (), "GraphQL": (), "Redux": (), "jQuery": (), "Bootstrap": (),
+        "Tailwind CSS": ("tailwind",), "Flutter": (), "React Native": (), "Selenium": (), "Pytest": (),
+        "JUnit": (), "Celery": (), "Airflow": ("apache airflow",),
+    },
+    "Databases": {
+        "PostgreSQL": ("postgres", "psql"), "MySQL": (), "SQLite": (), "MongoDB": ("mongo",), "Redis": (),
+        "Cassandra": (), "DynamoDB": (), "Elasticsearch": ("elastic search", "opensearch"), "Oracle": ("oracle db",),
+        "SQL Server": ("mssql", "microsoft sql server"), "MariaDB": (), "Neo4j": (), "Snowflake": (),
+        "BigQuery": ("big query",), "Firebase": ("firestore",), "Supabase": (), "CouchDB": (), "InfluxDB": (),
+    },
+    "Tools": {
+        "Git": (), "GitHub": (), "GitLab": (), "Bitbucket": (), "Docker": (), "Kubernetes": ("k8s",),
+        "Terraform": (), "Ansible": (), "Jenkins": (), "GitHub Actions": (), "CircleCI": (), "Jira": (),
+        "Confluence": (), "Postman": (), "Linux": ("unix",), "Nginx": (), "Prometheus": (), "Grafana": (),
+        "Tableau": (), "Power BI": ("powerbi",), "Excel": ("ms excel", "microsoft excel"), "Figma": (),
+        "VS Code": ("vscode", "visual studio code"), "Jupyter": ("jupyter notebook",), "Webpack": (),
+        "Helm": (), "RabbitMQ": (), "Splunk": (), "Datadog": (), "CI/CD": ("ci cd", "cicd"),
+    },
+    "Platforms/Cloud": {
+        "AWS": ("amazon web services",), "Azure": ("microsoft azure",), "GCP": ("google cloud", "google cloud platform"),
+        "Heroku": (), "Vercel": (), "Netlify": (), "DigitalOcean": ("digital ocean",), "OpenShift": (),
+        "AWS Lambda": ("Lambda",), "EC2": ("aws ec2",), "S3": ("aws s3",), "Databricks": (), "Android": (), "iOS": (),
+        "Salesforce": (), "SAP": (),
+    },
+}
+# Aliases that are ordinary words or single letters: only matched with this exact casing.
+CASE_SENSITIVE = frozenset({"C", "R", "Go", "Rust", "Swift", "Express", "Spark", "Node", "Spring", "Rails", "Oracle",
+                            "Excel", "Lambda", "Helm", "Julia", "Dart", "TS", "TF"})
+_WORD_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789")
+# ...and not when glued to "-", "&" or a year: "Go-getter", "R&D", "Spring 2020"
+_YEAR_AFTER_RE = re.compile(r"\s*,?\s*(?:19|20)\d{2}(?!\d)")
+_YEAR_BEFORE_RE = re.compile(r"(?<!\d)(?:19|20)\d{2}\s*,?\s*$")
+PROFICIENCY_RE = re.compile(r"\b(?:beginner|basic|novice|intermediate|advanced|expert|proficient|familiar|fluent)\b",
+                            re.IGNORECASE)
+
+class SkillMatcher:
+    """Aho-Corasick automaton over every alias in the taxonomy: one pass over the
+    text finds all skill mentions, however many aliases there are."""
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, Tuple[str, ...]]] = SKILL_TAXONOMY):
+        self.category_of: Dict[str, str] = {}
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str]]] = [[]]  # state -> [(alias as written, canonical)]
+        for category, skills in taxonomy.items():
+            for canonical, aliases in skills.items():
+                self.category_of[canonical] = category
+                for alias in {canonical, *aliases}:
+                    self._add(alias, canonical)
+        self._link()
+
+    def _add(self, alias: str, canonical: str) -> None:
+        state = 0
+        for char in alias.lower():
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append((alias, canonical))
+
+    def _link(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                if state:  # children of the root fail back to the root
+                    fallback = self._fail[state]
+                    while fallback and char not in self._goto[fallback]:
+                        fallback = self._fail[fallback]
+                    self._fail[nxt] = self._goto[fallback].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def _mentions(self, text: str) -> List[Tuple[int, int, str]]:
+        lowered = text.lower()
+        found = []
+        state = 0
+        for i, char in enumerate(lowered):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for alias, canonical in self._out[state]:
+                start = i - len(alias) + 1
+                before = lowered[start - 1] if start > 0 else " "
+                after = lowered[i + 1] if i + 1 < len(lowered) else " "
+                if before in _WORD_CHARS or after in _WORD_CHARS or after in "+#":
+                    continue  # part of a longer word: "java" in "javascript", "c" in "c++"
+                if alias in CASE_SENSITIVE and (text[start:i + 1] != alias or before in "-&" or after in "-&"
+                                                or _YEAR_AFTER_RE.match(text, i + 1)
+                                                or _YEAR_BEFORE_RE.search(text, max(0, start - 8), start)):
+                    continue
+                found.append((start, i + 1, canonical))
+        return found
+
+    def find(self, text: str) -> List[str]:
+        """Canonical skills mentioned in text, in order of first mention; overlapping aliases keep the longest."""
+        skills: List[str] = []
+        covered_until = -1
+        for start, end, canonical in sorted(self._mentions(text), key=lambda m: (m[0], m[0] - m[1])):
+            if start < covered_until:
+                continue
+            covered_until = end
+            if canonical not in skills:
+                skills.append(canonical)
+        return skills
+
+    def categorize(self, skills: List[str]) -> Dict[str, List[str]]:
+        categories: Dict[str, List[str]] = {category: [] for category in SKILL_TAXONOMY}
+        for skill in skills:
+            categories[self.category_of[skill]].append(skill)
+        return categories
+
+def compare_skills(required: List[str], available: List[str]) -> Tuple[List[str], List[str]]:
+    """(matching, missing) required skills, in the order they were asked for."""
+    have = set(available)
+    return [s for s in required if s in have], [s for s in required if s not in have]
+
+def render_techstack(categories: Dict[str, List[str]], other: List[str] = ()) -> str:
+    lines = [f"{category}: {', '.join(skills)}" for category, skills in categories.items() if skills]
+    if other:
+        lines.append(f"Other: {', '.join(other)}")  # listed, but not in the taxonomy
+    return "\n".join(lines) if lines else "Not mentioned in the resume."
+
+skill_matcher = SkillMatcher()  # built once per process, at import
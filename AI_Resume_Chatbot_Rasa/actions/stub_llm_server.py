@@ -0,0 +1,149 @@
+"""Deterministic OpenAI-compatible stub LLM server for offline runs and load tests.
+
+    python -m actions.stub_llm_server --port 8089 --latency 0.8 --jitter 0.2 --error-rate 0.02 --rate-limit-rate 0.05
+    LLM_BACKEND=stub rasa run actions
+
+Answers depend only on the prompt; latency, 503s and 429s (with Retry-After)
+come from a seeded RNG so runs are reproducible.
+"""
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict
+
+STRUCTURED_MARKER = "return ONE JSON object"  # see resume_analysis.build_structured_prompt
+
+def stub_answer(prompt: str) -> str:
+    digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    if STRUCTURED_MARKER in prompt:
+        return json.dumps({
+            "skills": {"Technical Skills": ["Python", "SQL"], "Soft Skills": ["Communication"]},
+            "summary": f"Stub summary {digest}.",
+            "experience": [{"title": "Engineer", "company": "Stub Corp", "duration": "2020 – Present",
+                            "responsibilities": ["Built stub systems"]}],
+            "techstack": {"Programming Languages": ["Python"], "Frameworks/Libraries": [], "Databases": ["SQL"],
+                          "Tools": [], "Platforms/Cloud": []},
+            "education": [{"degree": "B.Tech", "institution": "Stub University", "graduation_year": "2020", "cgpa": ""}],
+            "contact": {"name": "Stub Candidate", "email": "stub@example.com", "phone": "", "location": "",
+                        "linkedin": "", "other": ""},
+            "projects": [],
+            "certifications": [],
+        })
+    first_line = next((line.strip() for line in prompt.splitlines() if line.strip()), "")
+    return f"[stub {digest}] {first_line[:120]} ({len(prompt)} prompt chars)"
+
+class StubConfig:
+    def __init__(self, latency: float, jitter: float, error_rate: float, rate_limit_rate: float,
+                 retry_after: float, seed: int):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "ok": 0, "errors_503": 0, "rate_limited_429": 0}
+
+    def draw(self):
+        with self._lock:
+            self.counters["requests"] += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return 429, 0.0
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 503, delay
+        return 200, delay
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+def make_handler(config: StubConfig):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real upstream
+
+        def do_GET(self):
+            if self.path.rstrip("/") in ("/health", "/v1/health"):
+                self._send(200, {"status": "ok", **config.counters})
+            else:
+                self._send(404, {"error": "not found"})
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send(404, {"error": "not found"})
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+            except ValueError:
+                self._send(400, {"error": "invalid JSON"})
+                return
+            status, delay = config.draw()
+            time.sleep(delay)
+            if status == 429:
+                config.count("rate_limited_429")
+                self._send(429, {"error": "rate limited"}, {"Retry-After": f"{config.retry_after:g}"})
+            elif status == 503:
+                config.count("errors_503")
+                self._send(503, {"error": "upstream unavailable"})
+            else:
+                config.count("ok")
+                self._send(200, {
+                    "id": "stub-" + hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:12],
+                    "object": "chat.completion",
+                    "model": body.get("model", "stub-model"),
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": stub_answer(prompt)}}],
+                })
+
+        def _send(self, status: int, payload: Dict[str, Any], headers: Dict[str, str] = None):
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass  # one line per request would dominate a load test
+
+    return Handler
+
+def serve(host: str, port: int, config: StubConfig) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    return server
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.5, help="mean seconds per answer")
+    parser.add_argument("--jitter", type=float, default=0.1, help="+/- seconds around --latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    config = StubConfig(args.latency, args.jitter, args.error_rate, args.rate_limit_rate, args.retry_after, args.seed)
+    server = serve(args.host, args.port, config)
+    print(f"Stub LLM listening on http://{args.host}:{args.port}/v1/chat/completions")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
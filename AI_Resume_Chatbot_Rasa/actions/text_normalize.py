@@ -0,0 +1,92 @@
+import re
+from collections import Counter
+from typing import Dict, List, Set
+from .resume_sections import match_heading
+
+BULLET_GLYPHS = "•●○◦▪▫■□➢➤►▶✓✔❖◆◇·*‣⁃–—"
+_BULLET_RE = re.compile(rf"^[{re.escape(BULLET_GLYPHS)}]+\s*(?=\S)")
+_SPACE_RE = re.compile(r"[ \t\u00a0\u2000-\u200b\u3000]+")
+_HYPHEN_BREAK_RE = re.compile(r"([A-Za-z]*[a-z])-\n[ \t]*([a-z][A-Za-z]*)")
+_WORD_RE = re.compile(r"[A-Za-z]+")
+_DIGITS_RE = re.compile(r"\d+")
+_PAGE_NUMBER_RE = re.compile(r"^(?:page\s*)?#(?:\s*(?:of|/)\s*#)?$")
+EDGE_LINES = 2  # lines at the top/bottom of a page checked for running headers/footers
+
+def normalize_line(line: str) -> str:
+    line = _SPACE_RE.sub(" ", line).strip()
+    return _BULLET_RE.sub("- ", line)
+
+def _edge_key(line: str) -> str:
+    # "Page 2 of 3" and "Page 3 of 3" are the same footer
+    return _DIGITS_RE.sub("#", normalize_line(line).lower())
+
+def repeated_edge_lines(pages: List[str]) -> Set[str]:
+    """Lines that open or close at least half the pages: running headers, footers, page numbers."""
+    if len(pages) < 2:
+        return set()
+    seen: Counter = Counter()
+    for page in pages:
+        lines = [l for l in page.splitlines() if l.strip()]
+        seen.update({_edge_key(l) for l in lines[:EDGE_LINES] + lines[-EDGE_LINES:]})
+    return {key for key, count in seen.items() if count >= max(2, len(pages) / 2)}
+
+def _is_list(line: str) -> bool:
+    # "python, django, flask": joining the next line would glue two items into one
+    items = line.split(",")
+    return len(items) >= 3 and all(len(item.split()) <= 3 for item in items)
+
+def _is_item(line: str) -> bool:
+    # "postgresql" on a line of its own: one entry of a one-per-line list, not half a sentence
+    return len(line.split()) <= 3 and not line.endswith((".", "!", "?"))
+
+def _is_continuation(previous: str, line: str) -> bool:
+    # A hard line break inside a sentence: previous line doesn't end a clause, this one starts lowercase.
+    return (bool(previous) and not previous.endswith((".", ":", ";", "!", "?")) and line[:1].islower()
+            and match_heading(previous) is None and not _is_list(previous) and not _is_list(line)
+            and not _is_item(previous) and not _is_item(line))
+
+def dehyphenate(text: str) -> str:
+    """Undo line-end hyphenation ("develop-\nment") only where the joined word appears elsewhere in the text;
+    otherwise the hyphen is real ("high-\nperformance", "scikit-\nlearn") and only the line break goes."""
+    words = {w.lower() for w in _WORD_RE.findall(_HYPHEN_BREAK_RE.sub(" ", text))}
+
+    def join(match) -> str:
+        left, right = match.groups()
+        return left + right if (left + right).lower() in words else f"{left}-{right}"
+    return _HYPHEN_BREAK_RE.sub(join, text)
+
+def normalize_pages(pages: List[str]) -> str:
+    """Dehyphenate, drop running headers/footers, normalize bullets and collapse whitespace."""
+    repeated = repeated_edge_lines(pages)
+    emitted: Set[str] = set()  # keep the first occurrence, e.g. the candidate's name heading page one
+    kept_pages = []
+    for page in pages:
+        lines = page.splitlines()
+        non_empty = [i for i, l in enumerate(lines) if l.strip()]
+        edges = set(non_empty[:EDGE_LINES] + non_empty[-EDGE_LINES:])
+        kept = []
+        for i, line in enumerate(lines):
+            key = _edge_key(line) if i in edges else ""
+            if key in repeated:
+                if key in emitted or _PAGE_NUMBER_RE.match(key):
+                    continue
+                emitted.add(key)
+            kept.append(line)
+        kept_pages.append("\n".join(kept))
+    text = dehyphenate("\n".join(kept_pages))
+    out: List[str] = []
+    for raw in text.splitlines():
+        line = normalize_line(raw)
+        if not line:
+            if out and out[-1]:
+                out.append("")
+        elif out and _is_continuation(out[-1], line):
+            out[-1] = f"{out[-1]} {line}"
+        else:
+            out.append(line)
+    return "\n".join(out).strip()
+
+def normalization_report(original: str, normalized: str) -> Dict[str, float]:
+    saved = len(original) - len(normalized)
+    return {"original_chars": len(original), "normalized_chars": len(normalized),
+            "reduction_pct": round(100 * saved / len(original), 1) if original else 0.0}
@@ -0,0 +1,81 @@
+"""Upload endpoint that keeps resume PDFs out of the Rasa tracker.
+
+    python -m actions.upload_server                     # http://127.0.0.1:5057/resumes
+    curl --data-binary @cv.pdf -H "Content-Type: application/pdf" http://127.0.0.1:5057/resumes
+    -> {"resume_id": "...", "file_name": ""}
+
+The PDF is validated, parsed and stored exactly like /upload (same resume store,
+so run it next to the action server with the same RESUME_STORE_DIR). The client
+then sends only the id: `"metadata": {"resume_id": "<id>", "file_name": "cv.pdf"}`.
+Base64 in message metadata also works, but Rasa keeps message metadata in the
+tracker's UserUttered events, so the whole PDF is re-sent with every later
+webhook call of that conversation.
+"""
+import os
+import sys
+import json
+import argparse
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Tuple
+from .pdf_extraction import (PDF_EXTRACT_TIMEOUT, PDF_MAX_BYTES, extract_resume_from_bytes, get_pdf_pool,
+                             shutdown_pdf_pool, store_extracted_resume)
+
+UPLOAD_HOST = os.getenv("UPLOAD_HOST", "127.0.0.1")
+UPLOAD_PORT = int(os.getenv("UPLOAD_PORT", "5057"))
+
+def handle_upload(data: bytes, file_name: str = "") -> Tuple[int, Dict[str, Any]]:
+    """(HTTP status, JSON body) for one uploaded PDF."""
+    pool = get_pdf_pool()
+    job = pool.submit(extract_resume_from_bytes, data)
+    try:
+        result = job.result(timeout=PDF_EXTRACT_TIMEOUT)
+    except FutureTimeout:
+        shutdown_pdf_pool(pool, terminate=True)
+        return 504, {"error": "⏱️ Processing the PDF took too long. Please try a smaller or simpler file."}
+    except BrokenProcessPool:
+        shutdown_pdf_pool(pool)
+        return 500, {"error": "❌ Error extracting PDF: the PDF worker stopped unexpectedly."}
+    if result.error:
+        return 422, {"error": result.error}
+    return 200, {"resume_id": store_extracted_resume(result, file_name or "uploaded file"), "file_name": file_name}
+
+class _UploadHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        if self.path.split("?")[0].rstrip("/") != "/resumes":
+            self._reply(404, {"error": "not found"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > PDF_MAX_BYTES:
+            self._reply(413, {"error": "❌ File too large. Please upload a PDF under 2MB."})
+            return
+        status, body = handle_upload(self.rfile.read(length), self.headers.get("X-File-Name", ""))
+        self._reply(status, body)
+
+    def _reply(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=UPLOAD_HOST)
+    parser.add_argument("--port", type=int, default=UPLOAD_PORT)
+    args = parser.parse_args(argv)
+    server = ThreadingHTTPServer((args.host, args.port), _UploadHandler)
+    server.daemon_threads = True
+    print(f"Resume uploads at http://{args.host}:{args.port}/resumes")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_pdf_pool()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
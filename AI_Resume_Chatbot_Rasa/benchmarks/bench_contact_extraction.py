@@ -0,0 +1,123 @@
+"""Local contact extraction vs the LLM path of ActionAskContact: speed and agreement.
+
+For every resume PDF, times extract_contact (median over --repeat) and one LLM
+answer to the ActionAskContact prompt, then checks each locally extracted
+field against the LLM's answer. Use a real backend for agreement numbers (the
+stub LLM only measures overhead):
+
+    LLM_BACKEND=openrouter python -m benchmarks.bench_contact_extraction resumes/ --repeat 200
+"""
+import os
+import re
+import sys
+import json
+import time
+import asyncio
+import argparse
+import platform
+from statistics import median
+from typing import Any, Dict, List
+
+from actions.actions import ActionAskContact
+from actions.batch_ingest import find_pdfs
+from actions.contact_extraction import CONTACT_MIN_CONFIDENCE, extract_contact
+from actions.llm_client import LLM_MODEL, LLMServiceError, close_http_client, request_completion
+from actions.llm_backends import backend
+from actions.pdf_extraction import extract_resume_from_pdf
+from actions.prompt_budget import budget_resume_text
+from actions.resume_sections import ACTION_SECTIONS
+
+FIELDS = ("name", "email", "phone", "location", "linkedin", "github")
+
+def _plain(value: str) -> str:
+    return re.sub(r"^(?:https?://)?(?:www\.)?", "", value.lower()).rstrip("/")
+
+def field_in_answer(field: str, value: str, answer: str) -> bool:
+    """Whether the LLM's free-text answer contains the locally extracted value."""
+    if field == "phone":
+        digits = re.sub(r"\D", "", value)[-10:]
+        return digits in re.sub(r"\D", "", answer)
+    if field in ("linkedin", "github"):
+        return _plain(value) in answer.lower()
+    return " ".join(value.lower().split()) in " ".join(answer.lower().split())
+
+def contact_prompt(action: ActionAskContact, text: str, sections) -> str:
+    # same excerpt and budget as answer_section_question, without the resume store
+    excerpt = "\n\n".join(text[start:end].strip() for name in ACTION_SECTIONS["contact"]
+                          for start, end in sections.get(name, [])) or text
+    return action.build_prompt(budget_resume_text(action.name(), text, sections, keep=ACTION_SECTIONS["contact"],
+                                                  excerpt=excerpt))
+
+async def bench(paths: List[str], repeat: int, use_llm: bool) -> List[Dict[str, Any]]:
+    action = ActionAskContact()
+    rows = []
+    for path in paths:
+        result = extract_resume_from_pdf(path)
+        if result.error:
+            print(f"{path}: {result.error}")
+            continue
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            details = extract_contact(result.text, result.sections, result.links)
+            timings.append(time.perf_counter() - start)
+        fields = details["fields"]
+        row = {"file": os.path.basename(path), "local_us": round(1e6 * median(timings), 1),
+               "confidence": details["confidence"], "local_fields": {f: fields[f] for f in FIELDS if fields[f]}}
+        if use_llm:
+            prompt = contact_prompt(action, result.text, result.sections)
+            start = time.perf_counter()
+            try:
+                answer = await request_completion(prompt)
+            except LLMServiceError as e:
+                answer = ""
+                row["llm_error"] = str(e)
+            row["llm_ms"] = round(1000 * (time.perf_counter() - start), 1)
+            row["agreement"] = {f: field_in_answer(f, v, answer) for f, v in row["local_fields"].items()}
+        rows.append(row)
+    await close_http_client()
+    return rows
+
+def summarize(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    summary: Dict[str, Any] = {
+        "resumes": len(rows),
+        "local_us_median": median(r["local_us"] for r in rows) if rows else 0,
+        "answered_locally": sum(r["confidence"] >= CONTACT_MIN_CONFIDENCE for r in rows),
+        "field_coverage": {f: sum(f in r["local_fields"] for r in rows) for f in FIELDS},
+    }
+    timed = [r for r in rows if "llm_ms" in r and "llm_error" not in r]
+    if timed:
+        summary["llm_ms_median"] = median(r["llm_ms"] for r in timed)
+        summary["speedup"] = round(1000 * summary["llm_ms_median"] / max(summary["local_us_median"], 1e-3))
+        checks = [(f, ok) for r in timed for f, ok in r["agreement"].items()]
+        summary["agreement_pct"] = {f: round(100 * sum(ok for g, ok in checks if g == f) / n)
+                                    for f in FIELDS for n in [sum(1 for g, _ in checks if g == f)] if n}
+    return summary
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("target", help="directory to walk for *.pdf, or a glob pattern")
+    parser.add_argument("--repeat", type=int, default=100, help="local extraction runs per resume; the median is reported")
+    parser.add_argument("--no-llm", action="store_true", help="only time the local extractor")
+    parser.add_argument("--out", default="results/bench_contact_extraction.json")
+    args = parser.parse_args(argv)
+    paths = find_pdfs(args.target)
+    if not paths:
+        print(f"No PDF files found for: {args.target}")
+        return 1
+    rows = asyncio.run(bench(paths, max(1, args.repeat), not args.no_llm))
+    report = {
+        "config": dict(vars(args), backend=backend.name, model=LLM_MODEL, min_confidence=CONTACT_MIN_CONFIDENCE),
+        "environment": {"python": platform.python_version(), "platform": platform.platform()},
+        "summary": summarize(rows),
+        "resumes": rows,
+    }
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(report["summary"], indent=2))
+    print(f"Wrote {len(rows)} results to {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""Micro-benchmark for the PDF extraction path over a synthetic resume corpus.
+
+Generates a reproducible corpus (1-50 pages; single-column, multi-column,
+scanned-like image pages, optionally an embedded TTF font) and times every
+extraction stage per document, with peak memory:
+
+    python -m benchmarks.bench_pdf_extraction --pages 1 2 5 10 25 50 --repeat 5
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import resource
+import tracemalloc
+from statistics import median
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import fitz  # PyMuPDF
+import magic  # pip install python-magic
+from actions.pdf_extraction import extract_resume_from_bytes, is_pdf_bytes
+from actions.resume_sections import PDF_KEYWORDS, headings_from_pdf
+from actions.text_normalize import normalize_pages
+
+LAYOUTS = ("text", "multicolumn", "scanned", "embedded_font")
+HEADINGS = ["PROFESSIONAL SUMMARY", "WORK EXPERIENCE", "TECHNICAL SKILLS", "PROJECTS", "EDUCATION", "CERTIFICATIONS"]
+WORDS = ("designed built led migrated optimized python kubernetes aws sql data pipeline service latency "
+         "team customers reduced improved platform api react django spark terraform analytics release "
+         "reliability cost throughput stakeholders mentoring architecture testing deployment monitoring").split()
+PAGE_RECT = fitz.paper_rect("a4")
+MARGIN = 50
+
+def _paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def _page_text(rng: random.Random, page_no: int) -> List[str]:
+    lines = []
+    if page_no == 0:
+        lines += ["Jane Candidate", "jane@example.com | +1 555 0100 | linkedin.com/in/jane", ""]
+    for heading in rng.sample(HEADINGS, 3):
+        lines.append(heading)
+        for _ in range(rng.randint(3, 6)):
+            lines.append("• " + _paragraph(rng, rng.randint(10, 22)))
+        lines.append("")
+    return lines
+
+def make_resume_pdf(pages: int, layout: str, seed: int, font_file: Optional[str] = None) -> bytes:
+    rng = random.Random(f"{seed}-{pages}-{layout}")
+    doc = fitz.open()
+    for page_no in range(pages):
+        page = doc.new_page(width=PAGE_RECT.width, height=PAGE_RECT.height)
+        text = "\n".join(_page_text(rng, page_no))
+        body = fitz.Rect(MARGIN, MARGIN, PAGE_RECT.width - MARGIN, PAGE_RECT.height - MARGIN)
+        if layout == "multicolumn":
+            half = body.width / 2
+            lines = text.splitlines()
+            left, right = "\n".join(lines[: len(lines) // 2]), "\n".join(lines[len(lines) // 2:])
+            page.insert_textbox(fitz.Rect(body.x0, body.y0, body.x0 + half - 10, body.y1), left, fontsize=9)
+            page.insert_textbox(fitz.Rect(body.x0 + half + 10, body.y0, body.x1, body.y1), right, fontsize=9)
+        elif layout == "embedded_font" and font_file:
+            page.insert_font(fontname="bench", fontfile=font_file)
+            page.insert_textbox(body, text, fontsize=10, fontname="bench")
+        else:
+            page.insert_textbox(body, text, fontsize=10)
+        page.insert_text((MARGIN, PAGE_RECT.height - 20), f"Jane Candidate - Page {page_no + 1} of {pages}", fontsize=8)
+    if layout == "scanned":
+        # Rasterize every page and rebuild the PDF from the images: no text layer, like a scan.
+        scanned = fitz.open()
+        for page in doc:
+            pix = page.get_pixmap(dpi=150, colorspace=fitz.csGRAY)
+            scanned.new_page(width=page.rect.width, height=page.rect.height).insert_image(page.rect, pixmap=pix)
+        doc.close()
+        doc = scanned
+    data = doc.tobytes(garbage=3, deflate=True)
+    doc.close()
+    return data
+
+def build_corpus(out_dir: str, page_counts: List[int], seed: int, font_file: Optional[str]) -> List[str]:
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for layout in LAYOUTS:
+        if layout == "embedded_font" and not font_file:
+            continue
+        for pages in page_counts:
+            path = os.path.join(out_dir, f"resume_{layout}_{pages:02d}p.pdf")
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(make_resume_pdf(pages, layout, seed, font_file))
+            paths.append(path)
+    return paths
+
+def _timed(fn: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def measure_stages(data: bytes) -> Dict[str, float]:
+    """One pass through each stage of the extraction path, in seconds."""
+    stages: Dict[str, float] = {}
+    _, stages["magic_sniff"] = _timed(lambda: magic.from_buffer(data[:2048], mime=True))
+    _, stages["header_sniff"] = _timed(lambda: is_pdf_bytes(data))
+    doc, stages["open"] = _timed(lambda: fitz.open(stream=data, filetype="pdf"))
+    page_times = []
+    pages = []
+    for page in doc:
+        text, seconds = _timed(page.get_text)
+        pages.append(text)
+        page_times.append(seconds)
+    stages["get_text_total"] = sum(page_times)
+    stages["get_text_per_page"] = stages["get_text_total"] / max(1, len(page_times))
+    _, stages["keyword_check"] = _timed(lambda: any(k in "".join(pages).lower() for k in PDF_KEYWORDS))
+    _, stages["headings_dict"] = _timed(lambda: headings_from_pdf(doc))
+    _, stages["normalize"] = _timed(lambda: normalize_pages(pages))
+    doc.close()
+    _, stages["end_to_end"] = _timed(lambda: extract_resume_from_bytes(data))
+    return stages
+
+def bench_document(path: str, repeat: int) -> Dict[str, Any]:
+    with open(path, "rb") as f:
+        data = f.read()
+    runs = [measure_stages(data) for _ in range(repeat)]
+    tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result = extract_resume_from_bytes(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count
+    return {
+        "file": os.path.basename(path),
+        "bytes": len(data),
+        "pages": page_count,
+        "accepted": not result.error,
+        "error": result.error,
+        "stages_ms": {stage: round(1000 * median(run[stage] for run in runs), 3) for stage in runs[0]},
+        "peak_python_kb": round(peak / 1024, 1),  # Python-side allocations only
+        "max_rss_growth_kb": rss_growth,  # includes MuPDF; only grows once the process high-water mark is passed
+    }
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", default="benchmarks/corpus")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 2, 5, 10, 25, 50])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per document; the median is reported")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--font-file", default="", help="TTF to embed for the embedded_font layout")
+    parser.add_argument("--out", default="results/bench_pdf_extraction.json")
+    args = parser.parse_args(argv)
+
+    paths = build_corpus(args.corpus, args.pages, args.seed, args.font_file or None)
+    documents = []
+    for path in paths:
+        doc = bench_document(path, args.repeat)
+        documents.append(doc)
+        stages = doc["stages_ms"]
+        print(f"{doc['file']:34s} {doc['pages']:3d}p open={stages['open']:7.2f}ms "
+              f"get_text={stages['get_text_total']:8.2f}ms ({stages['get_text_per_page']:.2f}/p) "
+              f"total={stages['end_to_end']:8.2f}ms peak={doc['peak_python_kb']:8.1f}KB "
+              f"{'ok' if doc['accepted'] else 'rejected'}")
+    report = {
+        "config": vars(args),
+        "environment": {"python": platform.python_version(), "pymupdf": fitz.VersionBind,
+                        "platform": platform.platform(), "cpus": os.cpu_count()},
+        "documents": documents,
+    }
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(documents)} results to {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
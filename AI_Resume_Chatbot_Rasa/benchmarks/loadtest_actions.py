@@ -0,0 +1,228 @@
+"""End-to-end load test for the action server's /webhook.
+
+Replays conversations (one upload, then N questions) against a running action
+server and reports throughput and p50/p95/p99 latency per action as JSON.
+By default it also starts the stub LLM in-process and, with --spawn, an action
+server pointed at it, so the numbers measure our code, not OpenRouter. Every
+session uploads the same resume, so the spawned server runs with the response
+cache, prefetch and one-shot analysis off and a throwaway resume store and
+corpus: each question really reaches the stub LLM, and the real store is left
+alone. --warm-cache keeps the response cache on to measure the cached path.
+
+    python -m benchmarks.loadtest_actions --resume path/to/resume.pdf --spawn \\
+        --sessions 50 --concurrency 10 --questions 5 --llm-latency 0.8
+"""
+import os
+import sys
+import json
+import math
+import time
+import uuid
+import base64
+import random
+import asyncio
+import argparse
+import tempfile
+import platform
+import threading
+import subprocess
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+import httpx
+from actions.stub_llm_server import StubConfig, serve
+
+UPLOAD_ACTION = "action_upload_resume"
+# Question mix: action -> (relative weight, user message that triggers it)
+QUESTION_MIX = {
+    "action_ask_skills": (5, "what are the candidate's skills"),
+    "action_ask_experience": (4, "tell me about the work experience"),
+    "action_ask_education": (3, "what is the education background"),
+    "action_ask_summary": (3, "give me a summary"),
+    "action_ask_techstack": (2, "what is the tech stack"),
+    "action_ask_projects": (2, "list the projects"),
+    "action_ask_contact": (2, "how can I contact the candidate"),
+    "action_ask_certifications": (1, "any certifications"),
+    "action_compare_skills": (2, "compare with a job needing Python, Kubernetes, AWS and SQL"),
+    "action_get_resume_stats": (1, "show resume statistics"),
+    "action_ask_general": (2, "does the candidate have leadership experience"),
+    "action_rank_candidates": (1, "/rank Python backend engineer with AWS and Kubernetes"),
+    "action_debug_slots": (1, "/debug_slots"),
+}
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100 * len(sorted_values)) - 1  # nearest-rank
+    return sorted_values[max(0, min(rank, len(sorted_values) - 1))]
+
+def webhook_payload(action: str, sender_id: str, text: str, slots: Dict[str, Any],
+                    metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {
+        "next_action": action,
+        "sender_id": sender_id,
+        "version": "3.1",
+        "domain": {},
+        "tracker": {
+            "sender_id": sender_id,
+            "slots": slots,
+            "latest_message": {"text": text, "intent": {}, "entities": [], "metadata": metadata or {}},
+            "latest_event_time": time.time(),
+            "followup_action": None,
+            "paused": False,
+            "events": [],
+            "latest_input_channel": "rest",
+            "active_loop": {},
+            "latest_action": {"action_name": "action_listen"},
+            "latest_action_name": "action_listen",
+        },
+    }
+
+class LoadTest:
+    def __init__(self, url: str, resume_b64: str, questions: int, seed: int):
+        self.url = url
+        self.resume_b64 = resume_b64
+        self.questions = questions
+        self.rng = random.Random(seed)
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, action: str, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        start = time.perf_counter()
+        try:
+            response = await client.post(self.url, json=payload)
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok, response = False, None
+        self.latencies[action].append(time.perf_counter() - start)
+        if not ok:
+            self.errors[action] += 1
+            return None
+        return response.json()
+
+    async def session(self, client: httpx.AsyncClient) -> None:
+        sender_id = f"loadtest-{uuid.uuid4().hex[:12]}"
+        slots: Dict[str, Any] = {"resume_uploaded": False, "resume_id": None, "resume_text": None}
+        result = await self.call(client, UPLOAD_ACTION, webhook_payload(
+            UPLOAD_ACTION, sender_id, "/upload", slots, {"resume_pdf_base64": self.resume_b64, "file_name": "loadtest.pdf"}))
+        if result is None:
+            return
+        for event in result.get("events", []):
+            if event.get("event") == "slot":
+                slots[event["name"]] = event["value"]
+        actions = list(QUESTION_MIX)
+        weights = [QUESTION_MIX[a][0] for a in actions]
+        for action in self.rng.choices(actions, weights=weights, k=self.questions):
+            await self.call(client, action, webhook_payload(action, sender_id, QUESTION_MIX[action][1], slots))
+
+    async def run(self, sessions: int, concurrency: int) -> float:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        slots = asyncio.Semaphore(concurrency)
+        async with httpx.AsyncClient(timeout=httpx.Timeout(300.0), limits=limits) as client:
+            async def one():
+                async with slots:
+                    await self.session(client)
+            start = time.perf_counter()
+            await asyncio.gather(*(one() for _ in range(sessions)))
+            return time.perf_counter() - start
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        per_action = {}
+        for action, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            per_action[action] = {
+                "requests": len(values),
+                "errors": self.errors[action],
+                "throughput_rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(1000 * percentile(ordered, 50), 1),
+                "p95_ms": round(1000 * percentile(ordered, 95), 1),
+                "p99_ms": round(1000 * percentile(ordered, 99), 1),
+                "max_ms": round(1000 * ordered[-1], 1),
+            }
+        total = sum(len(v) for v in self.latencies.values())
+        return {"elapsed_s": round(elapsed, 2), "requests": total, "errors": sum(self.errors.values()),
+                "throughput_rps": round(total / elapsed, 2), "actions": per_action}
+
+def spawn_action_server(port: int, stub_url: str, data_dir: str, warm_cache: bool) -> subprocess.Popen:
+    env = dict(os.environ, LLM_BACKEND="stub", STUB_LLM_URL=stub_url,
+               RESUME_STORE_DIR=os.path.join(data_dir, "resume_store"),
+               CANDIDATE_CORPUS_FILE=os.path.join(data_dir, "candidates.jsonl"),
+               RESUME_PREFETCH="false", RESUME_ANALYZE_ONCE="false", RESPONSE_CACHE_DB="")
+    if not warm_cache:
+        env["RESPONSE_CACHE_MAX_ENTRIES"] = "0"  # every answer is evicted as soon as it is stored
+    return subprocess.Popen(["rasa", "run", "actions", "--port", str(port)], env=env)
+
+async def wait_until_up(url: str, timeout: float = 60.0) -> None:
+    health = url.rsplit("/", 1)[0] + "/health"
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(health)).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Action server at {url} did not come up within {timeout:.0f}s")
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resume", required=True, help="PDF resume uploaded at the start of every session")
+    parser.add_argument("--url", default="http://localhost:5055/webhook")
+    parser.add_argument("--sessions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--questions", type=int, default=5, help="questions per session after the upload")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--spawn", action="store_true", help="start 'rasa run actions' with LLM_BACKEND=stub")
+    parser.add_argument("--warm-cache", action="store_true", help="keep the spawned server's response cache on")
+    parser.add_argument("--no-stub", action="store_true", help="don't start the stub LLM (server uses its own backend)")
+    parser.add_argument("--stub-port", type=int, default=8089)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-jitter", type=float, default=0.1)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--out", default="results/loadtest_actions.json")
+    args = parser.parse_args(argv)
+
+    with open(args.resume, "rb") as f:
+        resume_b64 = base64.b64encode(f.read()).decode("ascii")
+    stub = None
+    if not args.no_stub:
+        config = StubConfig(args.llm_latency, args.llm_jitter, args.llm_error_rate, args.llm_rate_limit_rate, 1.0, args.seed)
+        stub = serve("127.0.0.1", args.stub_port, config)
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+    port = httpx.URL(args.url).port or 5055
+    data_dir = tempfile.TemporaryDirectory(prefix="loadtest-") if args.spawn else None
+    server = spawn_action_server(port, f"http://127.0.0.1:{args.stub_port}/v1", data_dir.name,
+                                 args.warm_cache) if args.spawn else None
+    # without --spawn the server's own cache/prefetch settings apply, and repeated questions may be cache hits
+    mode = ("warm-cache" if args.warm_cache else "cold-cache") if args.spawn else "external-server"
+    try:
+        if server is not None:
+            asyncio.run(wait_until_up(args.url))
+        test = LoadTest(args.url, resume_b64, args.questions, args.seed)
+        elapsed = asyncio.run(test.run(args.sessions, args.concurrency))
+        report = test.report(elapsed)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if stub is not None:
+            stub.shutdown()
+        if data_dir is not None:
+            data_dir.cleanup()
+    report["mode"] = mode
+    report["config"] = {k: v for k, v in vars(args).items() if k != "resume"}
+    report["environment"] = {"python": platform.python_version(), "platform": platform.platform(),
+                             "cpus": os.cpu_count()}
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    for action, stats in report["actions"].items():
+        print(f"{action:28s} n={stats['requests']:5d} err={stats['errors']:3d} "
+              f"p50={stats['p50_ms']:8.1f}ms p95={stats['p95_ms']:8.1f}ms p99={stats['p99_ms']:8.1f}ms")
+    print(f"Mode: {mode}")
+    print(f"Total: {report['requests']} requests in {report['elapsed_s']}s ({report['throughput_rps']} req/s) -> {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
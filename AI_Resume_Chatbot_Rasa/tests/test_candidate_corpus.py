@@ -0,0 +1,76 @@
+from actions import candidate_corpus as candidate_corpus_module
+from actions.candidate_corpus import CandidateCorpus
+from actions import resume_sections
+from actions.resume_sections import segment_sections
+from actions.resume_store import ResumeStore
+
+PYTHON = "Backend engineer. Python, Django, AWS, PostgreSQL. Built REST APIs."
+JAVA = "Java developer. Spring Boot, Kafka, Oracle. Built payment services."
+
+def test_rank_orders_by_skills_and_text(tmp_path):
+    corpus = CandidateCorpus(str(tmp_path / "candidates.jsonl"))
+    corpus.add("py", PYTHON, "Ada")
+    corpus.add("java", JAVA, "Bob")
+    ranking = corpus.rank("Python backend engineer with Django and AWS")
+    assert [hit["resume_id"] for hit in ranking] == ["py"]
+    assert ranking[0]["matching"] == ["Python", "Django", "AWS"] and ranking[0]["missing"] == []
+
+def test_sees_candidates_added_by_another_process(tmp_path):
+    path = str(tmp_path / "candidates.jsonl")
+    server, ingest = CandidateCorpus(path), CandidateCorpus(path)
+    server.add("py", PYTHON)
+    assert server.stats()["candidates"] == 1
+    ingest.add("java", JAVA)
+    assert server.stats()["candidates"] == 2
+    assert server.rank("Kafka")[0]["resume_id"] == "java"
+
+def test_partial_last_line_is_read_once_complete(tmp_path):
+    path = tmp_path / "candidates.jsonl"
+    writer = CandidateCorpus(str(path))
+    writer.add("py", PYTHON)
+    line = path.read_bytes()
+    path.write_bytes(line + line.replace(b'"py"', b'"py2"')[:20])
+    reader = CandidateCorpus(str(path))
+    assert reader.stats()["candidates"] == 1
+    path.write_bytes(line + line.replace(b'"py"', b'"py2"'))
+    assert reader.stats()["candidates"] == 2
+
+def test_compact_drops_stale_lines_and_readers_reload(tmp_path):
+    path = tmp_path / "candidates.jsonl"
+    cli, server = CandidateCorpus(str(path)), CandidateCorpus(str(path))
+    cli.add("py", PYTHON, source="a.pdf")
+    cli.add("py", PYTHON, source="b.pdf")  # re-ingested from another file
+    cli.add("java", JAVA)
+    assert server.stats()["candidates"] == 2
+    assert cli.compact() == 1
+    assert len(path.read_text().splitlines()) == 2
+    cli.add("py3", PYTHON + " Kubernetes")
+    assert server.stats()["candidates"] == 3
+    assert cli.compact() == 0
+
+def test_skills_come_from_the_claimed_sections(tmp_path):
+    text = "EDUCATION\nSpring 2020, BSc\n\nSKILLS\nPython, Django\n"
+    corpus = CandidateCorpus(str(tmp_path / "candidates.jsonl"))
+    corpus.add("py", text, spans=segment_sections(text))
+    assert corpus.rank("Spring Boot and Python")[0]["missing"] == ["Spring Boot"]
+
+def test_readding_rewrites_only_changed_records(tmp_path):
+    path = tmp_path / "candidates.jsonl"
+    corpus = CandidateCorpus(str(path))
+    corpus.add("py", PYTHON, "Ada", "a.pdf")
+    corpus.add("py", PYTHON, "Ada")  # `index` passes no source
+    assert len(path.read_text().splitlines()) == 1
+    corpus.add("py", PYTHON, "Ada Lovelace")
+    assert len(path.read_text().splitlines()) == 2
+    assert corpus.rank("Python")[0]["source"] == "a.pdf"
+
+def test_index_skips_resumes_without_text(tmp_path, monkeypatch):
+    store = ResumeStore(str(tmp_path / "store"))
+    resume_id = store.put(PYTHON)
+    empty_id = "0" * 24
+    monkeypatch.setattr(candidate_corpus_module, "resume_store", store)
+    monkeypatch.setattr(resume_sections, "resume_store", store)
+    monkeypatch.setattr(candidate_corpus_module, "stored_resume_ids", lambda: [resume_id, empty_id])
+    monkeypatch.setattr(candidate_corpus_module, "candidate_corpus", CandidateCorpus(str(tmp_path / "candidates.jsonl")))
+    assert candidate_corpus_module.main(["index"]) == 0
+    assert candidate_corpus_module.candidate_corpus.stats()["candidates"] == 1
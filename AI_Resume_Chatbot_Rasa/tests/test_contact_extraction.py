@@ -0,0 +1,42 @@
+from actions.contact_extraction import CONTACT_MIN_CONFIDENCE, extract_contact, render_contact
+from actions.resume_sections import segment_sections
+
+def contact(text, links=()):
+    return extract_contact(text, segment_sections(text), links)
+
+def test_name_and_links_from_header():
+    text = ("Jane Doe\njane.doe@example.com | +1 (415) 555-0134 | linkedin.com/in/janedoe\nAustin, TX\n\n"
+            "EXPERIENCE\nAcme Corp, Senior Engineer\n2019 - 2023\n")
+    result = contact(text, ["https://github.com/janedoe"])
+    fields = result["fields"]
+    assert fields["name"] == "Jane Doe"
+    assert fields["email"] == "jane.doe@example.com"
+    assert fields["phone"] == "+1 (415) 555-0134"
+    assert fields["location"] == "Austin, TX"
+    assert fields["linkedin"] == "https://linkedin.com/in/janedoe"
+    assert fields["github"] == "https://github.com/janedoe"
+    assert result["confidence"] == 1.0
+
+def test_job_title_on_the_name_line_is_not_a_location():
+    fields = contact("John Smith, Senior Software Engineer\njohn@acme.io | (555) 123-4567\n")["fields"]
+    assert fields["name"] == "John Smith"
+    assert fields["location"] == ""
+    assert "Name: John Smith" in render_contact(fields)
+
+def test_document_title_is_not_a_name():
+    result = contact("Curriculum Vitae\nAlex Johnson\n")
+    assert result["fields"]["name"] == "Alex Johnson"
+    assert result["confidence"] < CONTACT_MIN_CONFIDENCE  # a bare name is not enough to skip the LLM
+
+def test_location_needs_a_label_or_a_place_shape():
+    assert contact("Priya Nair\nLocation: Bengaluru, India\n")["fields"]["location"] == "Bengaluru, India"
+    fields = contact("Priya Nair\nPython, Java, SQL\nNew York, NY\n")["fields"]
+    assert fields["name"] == "Priya Nair"
+    assert fields["location"] == "New York, NY"
+    fields = contact("Resume\nPriya Nair, Data Analyst\n")["fields"]
+    assert (fields["name"], fields["location"]) == ("Priya Nair", "")
+
+def test_nothing_found():
+    result = contact("")
+    assert result["confidence"] == 0
+    assert render_contact(result["fields"]) == "Not mentioned in the resume."
@@ -0,0 +1,87 @@
+import asyncio
+import pytest
+
+pytest.importorskip("httpx")
+from actions import llm_client, resilience  # noqa: E402
+from actions.rate_limit import PRIORITY_INTERACTIVE, PRIORITY_PREFETCH, AdmissionController, QueueTimeout, request_priority  # noqa: E402
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = resilience.CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    monkeypatch.setattr(llm_client, "circuit_breaker", breaker)
+    return breaker
+
+def test_queue_timeout_does_not_hold_the_half_open_trial(monkeypatch, breaker):
+    async def busy(*args, **kwargs):
+        raise QueueTimeout()
+    monkeypatch.setattr(llm_client.admission, "acquire", busy)
+    breaker.record_failure()
+    with pytest.raises(llm_client.LLMServiceError):
+        asyncio.run(llm_client._post_completion("prompt"))
+    assert breaker.allow()  # the trial slot is still free
+
+def test_cancelled_trial_is_released(monkeypatch, breaker):
+    async def hang(prompt, timeout):
+        await asyncio.sleep(60)
+    monkeypatch.setattr(llm_client, "admission", AdmissionController(rpm=0))
+    monkeypatch.setattr(llm_client, "_post_once", hang)
+    breaker.record_failure()
+
+    async def run():
+        task = asyncio.ensure_future(llm_client._post_completion("prompt"))
+        await asyncio.sleep(0.01)
+        assert not breaker.allow()  # the trial is running
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    asyncio.run(run())
+    assert breaker.allow()
+
+def test_queue_wait_is_capped_by_the_turn_deadline(monkeypatch, breaker):
+    waits = []
+
+    async def queued(tokens, priority=None, timeout=None, key=None):
+        waits.append(timeout)
+        raise QueueTimeout()
+    monkeypatch.setattr(llm_client, "LLM_TURN_DEADLINE", 2.0)
+    monkeypatch.setattr(llm_client.admission, "acquire", queued)
+    with pytest.raises(llm_client.LLMServiceError):
+        asyncio.run(llm_client._post_completion("prompt"))
+    assert 0 < waits[0] <= 2.0
+
+def test_no_upstream_call_once_the_deadline_has_passed(monkeypatch, breaker):
+    async def post(prompt, timeout):
+        raise AssertionError("called with no time left")
+    monkeypatch.setattr(llm_client, "LLM_TURN_DEADLINE", 0.0)
+    monkeypatch.setattr(llm_client, "admission", AdmissionController(rpm=0))
+    monkeypatch.setattr(llm_client, "_post_once", post)
+    with pytest.raises(llm_client.LLMServiceError):
+        asyncio.run(llm_client._post_completion("prompt"))
+
+def test_interactive_caller_promotes_a_queued_prefetch_call(monkeypatch, breaker):
+    async def post(prompt, timeout):
+        return f"answer to {prompt}"
+    monkeypatch.setattr(llm_client, "_post_once", post)
+    controller = AdmissionController(rpm=600, tpm=10**6, max_wait=5)  # one request per 0.1s
+    monkeypatch.setattr(llm_client, "admission", controller)
+
+    async def run():
+        for _ in range(600):
+            await controller.acquire(1)  # drain the burst
+        order = []
+
+        async def ask(prompt, priority):
+            request_priority.set(priority)
+            answer = await llm_client.request_completion(prompt)
+            order.append(prompt)
+            return answer
+        older = asyncio.ensure_future(ask("older prefetch", PRIORITY_PREFETCH))
+        await asyncio.sleep(0.01)
+        shared = asyncio.ensure_future(ask("shared", PRIORITY_PREFETCH))
+        await asyncio.sleep(0.01)
+        joined = await ask("shared", PRIORITY_INTERACTIVE)  # joins the queued prefetch call
+        await asyncio.gather(older, shared)
+        return joined, order
+    joined, order = asyncio.run(run())
+    assert joined == "answer to shared"
+    assert order[0] == "shared"  # promoted past the older prefetch call
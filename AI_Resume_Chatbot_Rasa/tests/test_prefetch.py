@@ -0,0 +1,22 @@
+import asyncio
+from actions import prefetch
+from actions.rate_limit import PRIORITY_PREFETCH, request_priority
+
+def test_counts_completed_and_failed_jobs(monkeypatch):
+    monkeypatch.setattr(prefetch, "counters", {"scheduled": 0, "completed": 0, "failed": 0})
+    monkeypatch.setattr(prefetch, "_slots", None)
+    priorities = []
+
+    async def ok():
+        priorities.append(request_priority.get())
+        return "answer"
+
+    async def fails():
+        raise RuntimeError("upstream down")
+
+    async def run():
+        prefetch.schedule_prefetch([ok, fails, ok])
+        await asyncio.gather(*prefetch._tasks)
+    asyncio.run(run())
+    assert prefetch.stats() == {"scheduled": 3, "completed": 2, "failed": 1, "running": 0}
+    assert priorities == [PRIORITY_PREFETCH, PRIORITY_PREFETCH]
@@ -0,0 +1,43 @@
+from actions.prompt_budget import (DEFAULT_RESUME_BUDGET, TRIM_MARKER, budget_for, budget_resume_text, count_tokens,
+                                   trim_sections, truncate_to_tokens)
+from actions.resume_sections import segment_sections
+
+def test_count_tokens():
+    assert count_tokens("") == 0
+    assert count_tokens("Python, SQL") == 4  # "Python" is two ~4-character pieces
+    assert count_tokens("internationalization") == 5  # long words are split into ~4-character pieces
+    assert count_tokens("a.b@c") == 5
+
+def test_per_action_budgets():
+    assert budget_for("action_ask_contact") == 800
+    assert budget_for("action_ask_contact") < budget_for("action_ask_skills")
+    assert budget_for("action_unknown") == DEFAULT_RESUME_BUDGET
+
+def test_truncate_to_tokens():
+    text = "word " * 100
+    assert truncate_to_tokens(text, 200) == text
+    trimmed = truncate_to_tokens(text, 50)
+    assert trimmed.endswith(TRIM_MARKER) and count_tokens(trimmed[:-len(TRIM_MARKER)]) <= 50
+
+def _resume(**sizes):
+    return "\n".join(f"{name.upper()}\n" + "word " * size for name, size in sizes.items())
+
+def test_sections_are_dropped_least_relevant_first():
+    text = _resume(experience=40, skills=40, education=40, projects=40, certifications=40)
+    spans = segment_sections(text)
+    trimmed = trim_sections(text, spans, budget=130)
+    assert "CERTIFICATIONS" not in trimmed and "PROJECTS" not in trimmed
+    assert "EXPERIENCE" in trimmed and "SKILLS" in trimmed and "EDUCATION" in trimmed
+    assert "EDUCATION" not in trim_sections(text, spans, budget=90)
+
+def test_sections_the_action_needs_are_kept():
+    text = _resume(experience=40, skills=40, certifications=40)
+    trimmed = trim_sections(text, segment_sections(text), budget=90, keep=("certifications",))
+    # skills would normally outlive certifications, but the action asked for certifications
+    assert "CERTIFICATIONS" in trimmed and "EXPERIENCE" in trimmed and "SKILLS" not in trimmed
+
+def test_budget_resume_text_leaves_small_resumes_alone():
+    text = _resume(skills=10)
+    assert budget_resume_text("action_ask_skills", text, segment_sections(text)) == text
+    excerpt = "word " * 1000
+    assert budget_resume_text("action_ask_contact", text, {}, excerpt=excerpt).endswith(TRIM_MARKER)
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from actions.rate_limit import PRIORITY_INTERACTIVE, PRIORITY_PREFETCH, AdmissionController, QueueTimeout, request_priority
+
+def test_disabled_controller_admits_everything():
+    async def run():
+        controller = AdmissionController(rpm=0, tpm=0)
+        for _ in range(100):
+            await controller.acquire(10**6)
+    asyncio.run(run())
+
+def test_burst_up_to_the_bucket_size_is_admitted_immediately():
+    async def run():
+        controller = AdmissionController(rpm=3, tpm=1000, max_wait=0.05)
+        for _ in range(3):
+            await controller.acquire(100)
+        with pytest.raises(QueueTimeout):
+            await controller.acquire(100)  # 3 rpm refills one request every 20s
+        return controller.stats()
+    stats = asyncio.run(run())
+    assert stats["admitted"] == 3 and stats["timed_out"] == 1 and stats["queue_depth"] == 0
+
+def test_token_bucket_limits_large_prompts():
+    async def run():
+        controller = AdmissionController(rpm=100, tpm=1000, max_wait=0.05)
+        await controller.acquire(900)
+        with pytest.raises(QueueTimeout):
+            await controller.acquire(900)
+    asyncio.run(run())
+
+def test_timeout_argument_shortens_the_wait():
+    async def run():
+        controller = AdmissionController(rpm=1, tpm=1000, max_wait=10)
+        await controller.acquire(1)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with pytest.raises(QueueTimeout):
+            await controller.acquire(1, timeout=0.05)
+        return loop.time() - start
+    assert asyncio.run(run()) < 1
+
+def test_interactive_requests_are_admitted_before_prefetch():
+    async def run():
+        controller = AdmissionController(rpm=600, tpm=10**6, max_wait=5)  # one request per 0.1s
+        for _ in range(600):
+            await controller.acquire(1)  # drain the burst
+        order = []
+
+        async def call(name, priority):
+            request_priority.set(priority)
+            await controller.acquire(1)
+            order.append(name)
+        prefetch = [asyncio.ensure_future(call(f"prefetch{i}", PRIORITY_PREFETCH)) for i in range(2)]
+        await asyncio.sleep(0.01)  # prefetch is queued first
+        interactive = asyncio.ensure_future(call("interactive", PRIORITY_INTERACTIVE))
+        await asyncio.gather(*prefetch, interactive)
+        return order
+    assert asyncio.run(run())[0] == "interactive"
+
+def test_promote_moves_a_queued_entry_ahead():
+    async def run():
+        controller = AdmissionController(rpm=600, tpm=10**6, max_wait=5)
+        for _ in range(600):
+            await controller.acquire(1)
+        order = []
+
+        async def call(name, key):
+            await controller.acquire(1, PRIORITY_PREFETCH, key=key)
+            order.append(name)
+        tasks = [asyncio.ensure_future(call(name, name)) for name in ("first", "second")]
+        await asyncio.sleep(0.01)
+        controller.promote("second", PRIORITY_INTERACTIVE)
+        await asyncio.gather(*tasks)
+        return order
+    assert asyncio.run(run()) == ["second", "first"]
@@ -0,0 +1,75 @@
+import pytest
+from actions import resilience
+from actions.resilience import CircuitBreaker, backoff_delay, parse_retry_after
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(resilience.time, "monotonic", fake)
+    return fake
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow()
+    assert breaker.stats()["opened"] == 1 and breaker.stats()["rejected"] == 1
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+
+def test_half_open_lets_exactly_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.state == "half_open"
+    assert breaker.allow()
+    assert not breaker.allow()  # a second caller while the trial runs
+
+def test_trial_success_closes_and_failure_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open" and breaker.stats()["opened"] == 2
+    clock.now += 30
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow()
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-3") == 0.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0  # a date in the past
+
+def test_backoff_delay_is_capped_and_honors_retry_after(monkeypatch):
+    monkeypatch.setattr(resilience.random, "uniform", lambda low, high: high)
+    assert backoff_delay(0) == resilience.LLM_BACKOFF_BASE
+    assert backoff_delay(50) == resilience.LLM_BACKOFF_MAX
+    assert backoff_delay(0, retry_after=4) == 4 + resilience.LLM_BACKOFF_BASE / 4
+
+def test_released_trial_lets_the_next_caller_try(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow()
+    breaker.release_trial()  # the trial was cancelled before the upstream answered
+    assert breaker.state == "half_open"
+    assert breaker.allow()
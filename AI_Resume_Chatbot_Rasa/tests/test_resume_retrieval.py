@@ -0,0 +1,60 @@
+import pytest
+from actions import resume_retrieval
+from actions.resume_retrieval import bm25_scores, build_chunk_index, chunk_resume, retrieval_context, tokenize
+from actions.resume_sections import segment_sections
+from actions.resume_store import ResumeStore
+
+RESUME = """Jane Doe
+jane@example.com | +1 555 123 4567
+
+EXPERIENCE
+Acme Corp, Backend Engineer, 2019 - 2023
+Led a team of four building payment APIs in Python and Django.
+
+EDUCATION
+B.Tech Computer Science, IIT Delhi, 2019
+
+SKILLS
+Python, Django, node.js, C++, Kubernetes
+"""
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ResumeStore(str(tmp_path))
+    monkeypatch.setattr(resume_retrieval, "resume_store", store)
+    return store
+
+def test_tokenize_drops_stopwords_and_stems_plurals():
+    assert tokenize("What are the candidate's technologies and skills?") == ["technology", "skill"]
+    assert tokenize("node.js, C++, C#, B.Tech") == ["node.js", "c++", "c#", "b.tech"]
+    assert tokenize("class address") == ["class", "address"]
+
+def test_chunks_split_long_sections_on_line_boundaries():
+    text = "EXPERIENCE\n" + "".join(f"line {i} of the job history\n" for i in range(40))
+    chunks = chunk_resume(text, segment_sections(text), chunk_tokens=50)
+    assert len(chunks) > 1 and all(section == "experience" for _, _, section in chunks)
+    assert all(text[end - 1] == "\n" for _, end, _ in chunks)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(text)
+
+def test_bm25_prefers_the_chunk_with_the_rare_term():
+    index = {"chunks": [], "terms": [{"python": 1, "django": 1}, {"python": 1, "kubernetes": 1}, {"python": 2}]}
+    scores = bm25_scores(index, ["kubernetes", "python"])
+    assert max(range(3), key=scores.__getitem__) == 1
+    assert bm25_scores(index, ["rust"]) == [0.0, 0.0, 0.0]
+
+def test_question_words_are_expanded_to_section_names(store):
+    spans = segment_sections(RESUME)
+    resume_id = store.put(RESUME)
+    context = retrieval_context(resume_id, RESUME, spans, "Which university did she attend?", budget=500)
+    assert context.startswith("[education]") and "IIT Delhi" in context
+    assert "jane@example.com" in retrieval_context(resume_id, RESUME, spans, "how can I reach her", budget=500)
+
+def test_unrelated_questions_retrieve_nothing(store):
+    spans = segment_sections(RESUME)
+    assert retrieval_context(store.put(RESUME), RESUME, spans, "favourite colour?", budget=500) is None
+
+def test_chunk_index_terms_include_the_section_name():
+    index = build_chunk_index(RESUME, segment_sections(RESUME))
+    sections = [section for _, _, section in index["chunks"]]
+    assert "skills" in sections
+    assert index["terms"][sections.index("skills")]["skill"] >= 1
@@ -0,0 +1,44 @@
+from actions.resume_sections import match_heading, segment_sections
+
+RESUME = """Jane Doe
+jane@example.com
+
+SUMMARY
+Backend engineer with Experience building payment systems.
+
+EXPERIENCE
+Acme Corp, Senior Engineer
+Built Skills matrix tooling for the team.
+
+SKILLS:
+Python, Django, AWS
+"""
+
+def _section(text, spans, name):
+    return "".join(text[start:end] for start, end in spans.get(name, []))
+
+def test_match_heading():
+    assert match_heading("WORK EXPERIENCE") == "experience"
+    assert match_heading("Technical Skills:") == "skills"
+    assert match_heading("Built payment systems with Python and Django at scale") is None
+
+def test_segment_sections_splits_on_heading_lines():
+    spans = segment_sections(RESUME)
+    assert set(spans) == {"header", "summary", "experience", "skills"}
+    assert _section(RESUME, spans, "header").startswith("Jane Doe")
+    assert "Experience building payment systems" in _section(RESUME, spans, "summary")
+    assert "Acme Corp" in _section(RESUME, spans, "experience")
+    assert _section(RESUME, spans, "skills").strip() == "SKILLS:\nPython, Django, AWS"
+
+def test_heading_words_in_body_text_do_not_split_sections():
+    # as if the PDF font cues had reported these headings
+    headings = [("SUMMARY", "summary"), ("Experience", "experience"), ("Skills", "skills")]
+    text = "SUMMARY\nBackend engineer with Experience building APIs.\nExperience\nAcme Corp\nSkills\nPython\n"
+    spans = segment_sections(text, headings)
+    assert _section(text, spans, "summary") == "SUMMARY\nBackend engineer with Experience building APIs.\n"
+    assert _section(text, spans, "experience") == "Experience\nAcme Corp\n"
+    assert _section(text, spans, "skills") == "Skills\nPython\n"
+
+def test_missing_heading_is_skipped():
+    spans = segment_sections("Education\nBSc\n", [("Projects", "projects"), ("Education", "education")])
+    assert spans == {"education": [[0, 14]]}
@@ -0,0 +1,53 @@
+from datetime import date
+from actions.resume_sections import segment_sections
+from actions.resume_stats import highest_education, listed_skills, merge_ranges, parse_date_ranges, resume_stats
+
+TODAY = date(2024, 6, 15)
+
+def test_parse_date_range_formats():
+    text = "Jan 2019 – Mar 2020\n05/2020 - 12/2021\n2016-2018\nSept. 2022 to Present"
+    assert parse_date_ranges(text, TODAY) == [
+        (2019 * 12, 2020 * 12 + 3),
+        (2020 * 12 + 4, 2022 * 12),
+        (2016 * 12, 2018 * 12),
+        (2022 * 12 + 8, 2024 * 12 + 6),
+    ]
+
+def test_implausible_ranges_are_ignored():
+    # backwards, starting in the future, or phone-number-like digits
+    assert parse_date_ranges("2021 - 2019\n2025 - 2026\n+1 2019-2020123", TODAY) == []
+
+def test_future_end_is_clamped_to_today():
+    assert parse_date_ranges("2023 - 2030\nJan 2024 - Dec 2026", TODAY) == [
+        (2023 * 12, 2024 * 12 + 6), (2024 * 12, 2024 * 12 + 6)]
+
+def test_month_names_are_whole_words():
+    assert parse_date_ranges("Octopus 2019 - 2020\nsummary 2021 - 2022", TODAY) == [
+        (2019 * 12, 2020 * 12), (2021 * 12, 2022 * 12)]
+
+def test_merge_ranges_counts_overlaps_once():
+    assert merge_ranges([(10, 20), (0, 5), (15, 30), (30, 31)]) == [(0, 5), (10, 31)]
+    assert merge_ranges([]) == []
+
+def test_listed_skills_folds_aliases():
+    skills = listed_skills("SKILLS\nLanguages: Python, py, Go\n- k8s | Kubernetes | Agile")
+    assert skills == ["Python", "Go", "Kubernetes", "Agile"]
+
+def test_highest_education_prefers_the_highest_degree():
+    text = "EDUCATION\nB.Tech in Computer Science, IIT Delhi, 2016\nM.S. Computer Science\nStanford University 2018"
+    assert highest_education(text) == ("Master's", "M.S. Computer Science, Stanford University 2018")
+    assert highest_education("EDUCATION\nSelf-taught") is None
+
+def test_resume_stats():
+    text = ("Jane Doe\n\nEXPERIENCE\nAcme, Engineer, Jan 2020 - Present\nBeta, Intern, Jun 2019 - Mar 2020\n\n"
+            "SKILLS\nPython, Django, AWS\n\nEDUCATION\nBSc Physics, 2019\n")
+    stats = resume_stats(text, segment_sections(text), TODAY)
+    assert stats["experience_months"] == 2024 * 12 + 6 - (2019 * 12 + 5)
+    assert stats["positions"] == 2
+    assert stats["unique_skills"] == 3
+    assert stats["education"] == ("Bachelor's", "BSc Physics, 2019")
+
+def test_positions_unknown_without_dates():
+    text = "EXPERIENCE\nAcme, Engineer\nBuilt things\n"
+    stats = resume_stats(text, segment_sections(text), TODAY)
+    assert stats["positions"] is None and stats["experience_months"] is None
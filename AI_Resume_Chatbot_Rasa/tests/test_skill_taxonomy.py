@@ -0,0 +1,36 @@
+from actions.skill_taxonomy import SkillMatcher, compare_skills, render_techstack, skill_matcher
+
+def test_aliases_fold_to_canonical_names():
+    assert skill_matcher.find("k8s, postgres, sklearn and golang") == ["Kubernetes", "PostgreSQL", "scikit-learn", "Go"]
+
+def test_longest_overlapping_alias_wins():
+    assert skill_matcher.find("Ruby on Rails, React Native, Spring Boot") == ["Rails", "React Native", "Spring Boot"]
+
+def test_word_boundaries():
+    assert skill_matcher.find("JavaScript developer") == ["JavaScript"]
+    assert skill_matcher.find("C++, C#, C") == ["C++", "C#", "C"]
+    assert skill_matcher.find("Pythonic code in pyramid") == []
+
+def test_case_sensitive_aliases_need_their_casing():
+    assert skill_matcher.find("Go, R, Excel") == ["Go", "R", "Excel"]
+    assert skill_matcher.find("we go to r places to excel") == []
+
+def test_case_sensitive_aliases_next_to_hyphen_ampersand_or_year_are_rejected():
+    assert skill_matcher.find("Go-getter who led R&D") == []
+    assert skill_matcher.find("Spring 2020 semester, graduated 2019 Spring") == []
+    assert skill_matcher.find("C-level stakeholders") == []
+
+def test_fail_links_find_matches_inside_longer_prefixes():
+    matcher = SkillMatcher({"Tools": {"abcd": (), "bc": ()}})
+    assert matcher.find("abc bc") == ["bc"]
+    assert matcher.find("x abcd") == ["abcd"]
+
+def test_categorize_and_render():
+    categories = skill_matcher.categorize(["Python", "Django", "AWS"])
+    assert categories["Programming Languages"] == ["Python"] and categories["Platforms/Cloud"] == ["AWS"]
+    assert render_techstack(categories, ["Agile"]) == (
+        "Programming Languages: Python\nFrameworks/Libraries: Django\nPlatforms/Cloud: AWS\nOther: Agile")
+    assert render_techstack(skill_matcher.categorize([])) == "Not mentioned in the resume."
+
+def test_compare_skills_keeps_requested_order():
+    assert compare_skills(["AWS", "Python", "Go"], ["Python", "Go"]) == (["Python", "Go"], ["AWS"])
@@ -0,0 +1,23 @@
+from actions.text_normalize import dehyphenate, normalize_pages
+
+def test_real_hyphens_survive_a_line_break():
+    assert dehyphenate("Built high-\nperformance APIs") == "Built high-performance APIs"
+    assert dehyphenate("Used scikit-\nlearn daily") == "Used scikit-learn daily"
+
+def test_hyphenation_is_undone_when_the_word_appears_elsewhere():
+    assert dehyphenate("Led develop-\nment.\nDevelopment took a year.") == "Led development.\nDevelopment took a year."
+
+def test_wrapped_sentences_are_joined():
+    assert normalize_pages(["Worked on the payments\nteam for three years."]) == "Worked on the payments team for three years."
+
+def test_comma_separated_lists_are_not_joined():
+    text = normalize_pages(["Skills: python, django, flask\nsql, bash, docker"])
+    assert text == "Skills: python, django, flask\nsql, bash, docker"
+
+def test_running_footers_are_dropped():
+    pages = [f"Jane Doe\nPage {i} of 2\nline {i}\nPage {i} of 2" for i in (1, 2)]
+    assert "Page" not in normalize_pages(pages)
+
+def test_one_item_per_line_lists_are_not_joined():
+    text = normalize_pages(["Jane Doe\nSKILLS\npython\ndjango\npostgresql\ndocker\nmachine learning"])
+    assert text == "Jane Doe\nSKILLS\npython\ndjango\npostgresql\ndocker\nmachine learning"